@@ -1,19 +1,10 @@
+import os, sys
 import matplotlib.pyplot as plt
 import numpy as np
 
-class Modem:
-    def __init__(self, M, constellation, name):
-        self.M = M
-        self.constellation = constellation
-        self.name = name
-
-class PSKModem(Modem):
-    def __init__(self, M):        
-        m = np.arange(0,M) #all information symbols m={0,1,...,M-1}
-        I = 1/np.sqrt(2)*np.cos(m/M*2*np.pi)
-        Q = 1/np.sqrt(2)*np.sin(m/M*2*np.pi)
-        constellation = I + 1j*Q #reference constellation        
-        Modem.__init__(self, M, constellation, name='PSK') #set the modem attributes
+# PSKModem from the digimod package at the root of the repository
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from digimod.modem import PSKModem
 
 def plot_constellation(modem):
     fig, (ax1, ax2) = plt.subplots(1,2, figsize=(10,5))
@@ -14,11 +14,9 @@ constellation = np.exp(1j * np.pi / 4 * np.arange(8))
 # Generar la secuencia de bits aleatorios
 bits = np.random.randint(0, 2, size=num_symbols * bits_per_symbol)
 
-# Codificar los bits en símbolos
-symbols = []
-for i in range(0, len(bits), bits_per_symbol):
-    index = int(''.join(map(str, bits[i:i+bits_per_symbol])), 2)
-    symbols.append(constellation[index])
+# Codificar los bits en símbolos (grupos de 3 bits, MSB primero, con desplazamientos)
+index = bits.reshape(-1, bits_per_symbol) @ (1 << np.arange(bits_per_symbol - 1, -1, -1))
+symbols = constellation[index]
 
 # Generar la señal modulada
 t = np.linspace(0, duration, int(duration * bit_rate), endpoint=False)
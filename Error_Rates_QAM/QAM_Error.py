@@ -2,9 +2,9 @@ import numpy as np # for numerical computing
 import matplotlib.pyplot as plt # for plotting functions
 from matplotlib import cm # colormap for color palette
 from scipy.special import erfc
-from  modem import PSKModem,QAMModem,PAMModem,FSKModem
-from channels import awgn
-from ErrorRates import ser_awgn
+from  modem import getModem
+from channels import awgnSweep,spawnGenerators
+from ErrorRates import ser_cached
 
 nSym = 10**6 # Number of symbols to transmit
 EbN0dBs = np.arange(start=-10,stop = 20, step = 2) # Eb/N0 range in dB for simulation
@@ -12,7 +12,8 @@ mod_type = 'QAM' # Set 'PSK' or 'QAM' or 'PAM' or 'FSK'
 arrayOfM = [4,16,64,256] # array of M values to simulate
 #arrayOfM=[4,16,64,256] # uncomment this line if MOD_TYPE='QAM'
 coherence = 'coherent' #'coherent'/'noncoherent'-only for FSK
-modem_dict = {'psk': PSKModem,'qam':QAMModem,'pam':PAMModem,'fsk':FSKModem}
+seed = 2024 # simulation seed, every M gets its own reproducible stream
+rngs = spawnGenerators(seed,len(arrayOfM)) # independent substreams
 colors = plt.cm.jet(np.linspace(0,1,len(arrayOfM))) # colormap
 fig, ax = plt.subplots(nrows=1,ncols = 1)
 
@@ -21,22 +22,21 @@ for i, M in enumerate(arrayOfM):
     k=np.log2(M)
     EsN0dBs = 10*np.log10(k)+EbN0dBs # EsN0dB calculation
     SER_sim = np.zeros(len(EbN0dBs)) # simulated Symbol error rates
-    inputSyms = np.random.randint(low=0, high = M, size=nSym)
+    rng = rngs[i] # random stream of this M (same result if run in parallel)
+    inputSyms = rng.integers(low=0, high = M, size=nSym)
     # uniform random symbols from 0 to M-1
 
-    if mod_type.lower()=='fsk':
-        modem=modem_dict[mod_type.lower()](M,coherence)#choose modem from dictionary
-    else: #for all other modulations
-        modem = modem_dict[mod_type.lower()](M)#choose modem from dictionary
+    modem = getModem(mod_type,M,coherence,seed=seed) #cached modem (coherence only for FSK)
     modulatedSyms = modem.modulate(inputSyms) #modulate
-    for j,EsN0dB in enumerate(EsN0dBs):
-     receivedSyms = awgn(modulatedSyms,EsN0dB) #add awgn noise
-     if mod_type.lower()=='fsk': #demodulate (Refer Chapter 3)
-        detectedSyms = modem.demodulate(receivedSyms,coherence)
-    else: #demodulate (Refer Chapter 3)
-        detectedSyms = modem.demodulate(receivedSyms)
-    SER_sim[j] = np.sum(detectedSyms != inputSyms)/nSym
-    SER_theory = ser_awgn(EbN0dBs,mod_type,M,coherence) #theory SER
+    Es = np.sum(abs(modem.constellation)**2)/M # known mean symbol energy
+    # unit noise drawn once, rescaled for every Es/N0 point of the sweep
+    for j,receivedSyms in enumerate(awgnSweep(modulatedSyms,EsN0dBs,P=Es,rng=rng)):
+        if mod_type.lower()=='fsk': #demodulate (Refer Chapter 3)
+            detectedSyms = modem.demodulate(receivedSyms,coherence)
+        else: #demodulate (Refer Chapter 3)
+            detectedSyms = modem.demodulate(receivedSyms)
+        SER_sim[j] = np.sum(detectedSyms != inputSyms)/nSym
+    SER_theory = ser_cached('awgn',EbN0dBs,mod_type,M,coherence=coherence) #theory SER (disk cache)
     ax.semilogy(EbN0dBs, SER_sim, color=colors[i], marker='o', markersize=5, alpha=0.8, linestyle='')
     ax.semilogy(EbN0dBs, SER_theory, color=colors[i], marker='s', markersize=5, alpha=0.8, linestyle='')
 
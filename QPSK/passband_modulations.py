@@ -2,7 +2,25 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.signal import upfirdn
 
-def qpsk_mod(a, fc, OF, enable_plot = False):
+def carrier_waves(OF, N, dtype=np.float64):
+    """
+    Carrier samples cos(2 pi fc t) and sin(2 pi fc t) at t = n/fs, fs = OF*fc
+    Parameters:
+        OF : oversampling factor (samples per carrier cycle)
+        N : number of samples
+        dtype : float64 (default) or float32 for single precision waveforms
+    Returns:
+        (c, s) : tuple of cosine and sine carrier vectors of length N
+    One carrier cycle holds exactly OF samples, so a single cycle is computed
+    and repeated. The phase never grows with t, so float32 waveforms keep full
+    phase accuracy on long time bases and nothing is computed in float64.
+    """
+    phase = 2*np.pi*np.arange(OF)/OF # one carrier cycle
+    c = np.resize(np.cos(phase).astype(dtype), N)
+    s = np.resize(np.sin(phase).astype(dtype), N)
+    return (c, s)
+
+def qpsk_mod(a, fc, OF, enable_plot = False, dtype = np.float64):
     """
     Modulate an incoming binary stream using conventional QPSK
     Parameters:
@@ -10,6 +28,7 @@ def qpsk_mod(a, fc, OF, enable_plot = False):
         fc : carrier frequency in Hertz
         OF : oversampling factor - at least 4 is better
         enable_plot : True = plot transmitter waveforms (default False)
+        dtype : float64 (default) or float32 for single precision waveforms
     Returns:
         result : Dictionary containing the following keyword entries:
           s(t) : QPSK modulated signal vector with carrier i.e, s(t)
@@ -22,13 +41,13 @@ def qpsk_mod(a, fc, OF, enable_plot = False):
     # even/odd streams at 1/2Tb baud
         
     from scipy.signal import upfirdn #NRZ encoder
-    I = upfirdn(h=[1]*L, x=2*I-1, up = L)
-    Q = upfirdn(h=[1]*L, x=2*Q-1, up = L)
+    I = upfirdn(h=np.ones(L,dtype), x=(2*I-1).astype(dtype), up = L)
+    Q = upfirdn(h=np.ones(L,dtype), x=(2*Q-1).astype(dtype), up = L)
     
     fs = OF*fc # sampling frequency 
-    t=np.arange(0,len(I)/fs,1/fs)  #time base    
-    
-    I_t = I*np.cos(2*np.pi*fc*t);Q_t = -Q*np.sin(2*np.pi*fc*t)
+    t=np.arange(len(I),dtype=dtype)/fs  #time base    
+    (c, s) = carrier_waves(OF, len(I), dtype)
+    I_t = I*c;Q_t = -Q*s
     s_t = I_t + Q_t # QPSK modulated baseband signal
     
     if enable_plot:
@@ -62,7 +81,7 @@ def qpsk_mod(a, fc, OF, enable_plot = False):
     result['s(t)'] =s_t;result['I(t)'] = I;result['Q(t)'] = Q;result['t'] = t           
     return result
 
-def oqpsk_mod(a,fc,OF,enable_plot=False):
+def oqpsk_mod(a,fc,OF,enable_plot=False,dtype=np.float64):
     """
     Modulate an incoming binary stream using OQPSK
     Parameters:
@@ -70,6 +89,7 @@ def oqpsk_mod(a,fc,OF,enable_plot=False):
         fc : carrier frequency in Hertz
         OF : oversampling factor - at least 4 is better
         enable_plot : True = plot transmitter waveforms (default False)
+        dtype : float64 (default) or float32 for single precision waveforms
     Returns:
         result : Dictionary containing the following keyword entries:
           s(t) : QPSK modulated signal vector with carrier i.e, s(t)
@@ -81,15 +101,16 @@ def oqpsk_mod(a,fc,OF,enable_plot=False):
     I = a[0::2];Q = a[1::2] #even and odd bit streams
     # even/odd streams at 1/2Tb baud
      #NRZ encoder
-    I = upfirdn(h=[1]*L, x=2*I-1, up = L)
-    Q = upfirdn(h=[1]*L, x=2*Q-1, up = L)
+    I = upfirdn(h=np.ones(L,dtype), x=(2*I-1).astype(dtype), up = L)
+    Q = upfirdn(h=np.ones(L,dtype), x=(2*Q-1).astype(dtype), up = L)
 
-    I = np.hstack((I,np.zeros(L//2))) # padding at end
-    Q = np.hstack((np.zeros(L//2),Q)) # padding at start
+    I = np.hstack((I,np.zeros(L//2,dtype))) # padding at end
+    Q = np.hstack((np.zeros(L//2,dtype),Q)) # padding at start
     
     fs = OF*fc # sampling frequency 
-    t=np.arange(0,len(I)/fs,1/fs)  #time base
-    I_t = I*np.cos(2*np.pi*fc*t);Q_t = -Q*np.sin(2*np.pi*fc*t)
+    t=np.arange(len(I),dtype=dtype)/fs  #time base
+    (c, s) = carrier_waves(OF, len(I), dtype)
+    I_t = I*c;Q_t = -Q*s
     s = I_t + Q_t # QPSK modulated baseband signal
     
     if enable_plot:
@@ -117,13 +138,14 @@ def oqpsk_mod(a,fc,OF,enable_plot=False):
     result['s(t)'] =s;result['I(t)'] = I;result['Q(t)'] = Q;result['t'] = t           
     return result
 
-def piBy4_dqpsk_mod(a,fc,OF,enable_plot = False):
+def piBy4_dqpsk_mod(a,fc,OF,enable_plot = False,dtype = np.float64):
     """
     Modulate a binary stream using pi/4 DQPSK
     Parameters:
         a : input binary data stream (0's and 1's) to modulate
         fc : carrier frequency in Hertz
         OF : oversampling factor
+        dtype : float64 (default) or float32 for single precision waveforms
     Returns:
         result : Dictionary containing the following keyword entries:
           s(t) : pi/4 QPSK modulated signal vector with carrier
@@ -134,13 +156,14 @@ def piBy4_dqpsk_mod(a,fc,OF,enable_plot = False):
     (u,v)= piBy4_dqpsk_diff_encoding(a) # Differential Encoding for pi/4 QPSK
     #Waveform formation (similar to conventional QPSK)
     L = 2*OF # number of samples in each symbol (QPSK has 2 bits/symbol)    
-    U = np.tile(u, (L,1)).flatten('F')# odd bit stream at 1/2Tb baud
-    V = np.tile(v, (L,1)).flatten('F')# even bit stream at 1/2Tb baud
+    U = np.repeat(u.astype(dtype), L)# odd bit stream at 1/2Tb baud
+    V = np.repeat(v.astype(dtype), L)# even bit stream at 1/2Tb baud
     
     fs = OF*fc # sampling frequency    
-    t=np.arange(0, len(U)/fs,1/fs) #time base
-    U_t = U*np.cos(2*np.pi*fc*t)
-    V_t = -V*np.sin(2*np.pi*fc*t)
+    t=np.arange(len(U),dtype=dtype)/fs #time base
+    (c, s) = carrier_waves(OF, len(U), dtype)
+    U_t = U*c
+    V_t = -V*s
     s_t = U_t + V_t
     
     if enable_plot:
@@ -165,13 +188,14 @@ def piBy4_dqpsk_mod(a,fc,OF,enable_plot = False):
     result['s(t)'] =s_t;result['U(t)'] = U;result['V(t)'] = V;result['t'] = t
     return result
 
-def msk_mod(a, fc, OF, enable_plot = False):
+def msk_mod(a, fc, OF, enable_plot = False, dtype = np.float64):
     """
     Modulate an incoming binary stream using MSK
     Parameters:
         a : input binary data stream (0's and 1's) to modulate
         fc : carrier frequency in Hertz
         OF : oversampling factor (at least 4 is better)
+        dtype : float64 (default) or float32 for single precision waveforms
     Returns:
         result : Dictionary containing the following keyword entries:
           s(t) : MSK modulated signal with carrier
@@ -179,14 +203,14 @@ def msk_mod(a, fc, OF, enable_plot = False):
           sQ(t) : baseband Q channel waveform(no carrier)
           t: time base
     """ 
-    ak = 2*a-1 # NRZ encoding 0-> -1, 1->+1
+    ak = (2*a-1).astype(dtype) # NRZ encoding 0-> -1, 1->+1
     ai = ak[0::2]; aq = ak[1::2] # split even and odd bit streams
     L = 2*OF # represents one symbol duration Tsym=2xTb
     
     #upsample by L the bits streams in I and Q arms
     from scipy.signal import upfirdn, lfilter
-    ai = upfirdn(h=[1], x=ai, up = L)
-    aq = upfirdn(h=[1], x=aq, up = L)
+    ai = upfirdn(h=np.ones(1,dtype), x=ai, up = L)
+    aq = upfirdn(h=np.ones(1,dtype), x=aq, up = L)
     
     aq = np.pad(aq, (L//2,0), 'constant') # delay aq by Tb (delay by L/2)
     ai = np.pad(ai, (0,L//2), 'constant') # padding at end to equal length of Q
@@ -194,13 +218,14 @@ def msk_mod(a, fc, OF, enable_plot = False):
     #construct Low-pass filter and filter the I/Q samples through it
     Fs = OF*fc;Ts = 1/Fs;Tb = OF*Ts
     t = np.arange(0,2*Tb+Ts,Ts)
-    h = np.sin(np.pi*t/(2*Tb))# LPF filter
-    sI_t = lfilter(b = h, a = [1], x = ai) # baseband I-channel
-    sQ_t = lfilter(b = h, a = [1], x = aq) # baseband Q-channel
+    h = np.sin(np.pi*t/(2*Tb)).astype(dtype)# LPF filter
+    sI_t = lfilter(b = h, a = np.ones(1,dtype), x = ai) # baseband I-channel
+    sQ_t = lfilter(b = h, a = np.ones(1,dtype), x = aq) # baseband Q-channel
     
-    t=np.arange(0, Ts*len(sI_t), Ts) # for RF carrier
-    sIc_t = sI_t*np.cos(2*np.pi*fc*t) #with carrier
-    sQc_t = sQ_t*np.sin(2*np.pi*fc*t) #with carrier
+    t=np.arange(len(sI_t),dtype=dtype)*Ts # for RF carrier
+    (c, s) = carrier_waves(OF, len(sI_t), dtype)
+    sIc_t = sI_t*c #with carrier
+    sQc_t = sQ_t*s #with carrier
     s_t =  sIc_t - sQc_t# Bandpass MSK modulated signal
     
     if enable_plot:
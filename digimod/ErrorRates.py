@@ -0,0 +1,716 @@
+import numpy as np
+from numpy import log2,sqrt,sin,pi,exp
+# scipy.special.erfc and scipy.integrate.quad are imported by the functions
+# that use them, so importing this module only costs numpy
+
+def ser_awgn(EbN0dBs,mod_type=None,M=0,coherence=None):
+    """
+    Theoretical Symbol Error Rates for various modulations over AWGN
+    Parameters:
+        EbN0dBs : list of SNR per bit values in dB scale
+        mod_type : 'PSK','QAM','PAM','FSK','APSK'
+        M : Modulation level for the chosen modulation.
+            For PSK,PAM,FSK M can be any power of 2.
+            For QAM M can be any power of 2 from 4: square QAM for an even
+            power of 2, cross/rectangular QAM for an odd power of 2
+            For APSK M can be 16 or 32
+        coherence : 'coherent' for coherent FSK detection
+                    'noncoherent' for noncoherent FSK detection
+                This parameter is only applicable for FSK modulation
+    Returns:
+        SERs = list of symbol error rates
+    """
+    if mod_type==None:
+        raise ValueError('Invalid value for mod_type')
+    if (M<2) or ((M & (M -1))!=0): #if M not a power of 2
+        raise ValueError('M should be a power of 2')
+    
+    func_dict = {'psk': psk_awgn,'qam':qam_awgn,'pam':pam_awgn,'fsk':fsk_awgn,
+                 'apsk':apsk_awgn}
+    
+    gamma_s = log2(M)*(10**(EbN0dBs/10))
+    if mod_type.lower()=='fsk': #call appropriate function
+        return func_dict[mod_type.lower()](M,gamma_s,coherence) 
+    else:
+        return func_dict[mod_type.lower()](M,gamma_s) #call appropriate function
+
+def psk_awgn(M,gamma_s):
+    """
+    Theoretical Symbol Error Rates for PSK over AWGN
+    Parameters:
+        M : Modulation level for the chosen modulation.
+            For PSK, M can be any power of 2.
+        gamma_s : list of snr per symbol
+    Returns:
+        SERs = list of symbol error rates
+    """
+    from scipy.special import erfc
+    gamma_b = gamma_s/log2(M)
+    if (M==2):
+        SERs = 0.5*erfc(sqrt(gamma_b))
+    elif M==4:
+        Q = 0.5*erfc(sqrt(gamma_b))
+        SERs = 2*Q-Q**2
+    else:
+        SERs = erfc(sqrt(gamma_s)*sin(pi/M))
+    return SERs
+
+def qam_awgn(M,gamma_s):
+    """
+    Theoretical Symbol Error Rates for square QAM over AWGN
+    Parameters:
+        M : Modulation level for the chosen modulation.
+            For QAM, M must be even power of 2 (square QAM), an odd power
+            of 2 is passed on to crossqam_awgn.
+        gamma_s : list of snr per symbol
+    Returns:
+        SERs = list of symbol error rates
+    """
+    from scipy.special import erfc
+    if (M>=8) and (np.mod(np.log2(M),2)==1): # odd power of 2
+        return crossqam_awgn(M,gamma_s)
+    if (M==1) or (np.mod(np.log2(M),2)!=0): # M not a even power of 2
+        raise ValueError('Only square MQAM supported. M must be even power of 2')
+    SERs = 1-(1-(1-1/sqrt(M))*erfc(sqrt(3/2*gamma_s/(M-1))))**2
+    return SERs
+
+def crossqam_awgn(M,gamma_s):
+    """
+    Theoretical Symbol Error Rates for cross/rectangular QAM over AWGN
+    (8-QAM 4x2 rectangle, 32/128/512-QAM cross, as in modem.CrossQAMModem)
+    
+    Each point is correct when the noise stays inside its decision region.
+    With q = Q(d/2sigma) the probability of crossing one boundary, a point with
+    a neighbours along I and b neighbours along Q whose region is a (possibly
+    unbounded) rectangle is correct with probability (1-a*q)(1-b*q). The
+    points next to the missing corners of a cross have polygonal regions cut
+    by diagonal boundaries, their SER is evaluated exactly with
+    voronoi_error. The result is exact for rectangular and cross QAM.
+    Parameters:
+        M : Modulation level, an odd power of 2 (M>=8)
+        gamma_s : list of snr per symbol
+    Returns:
+        SERs = list of symbol error rates
+    """
+    from scipy.special import erfc
+    k = int(np.log2(M))
+    if (M<8) or (k%2==0):
+        raise ValueError('Cross/rectangular MQAM needs M an odd power of 2, M>=8')
+    m = (k-1)//2
+    if k==3:
+        (Sx,Sy,c) = (4,2,0) # rectangular 4x2 grid
+    else:
+        (Sx,Sy,c) = (3*2**(m-1),3*2**(m-1),2**(m-2)) # cross: S x S minus corners
+    (X,Y) = np.meshgrid(np.arange(Sx),np.arange(Sy),indexing='ij')
+    corner = ((X<c)|(X>=Sx-c))&((Y<c)|(Y>=Sy-c))
+    valid = np.pad(~corner,1) # occupied grid positions with an empty border
+    a = valid[:-2,1:-1].astype(int)+valid[2:,1:-1] # neighbours along I
+    b = valid[1:-1,:-2].astype(int)+valid[1:-1,2:] # neighbours along Q
+    # points with a missing corner position next to them along I or Q
+    hole = np.pad(corner,1)
+    nearCorner = (hole[:-2,1:-1]|hole[2:,1:-1]|hole[1:-1,:-2]|hole[1:-1,2:])[~corner]
+    (a,b) = (a[~corner],b[~corner])
+    points = (2*X[~corner]+1-Sx)+1j*(2*Y[~corner]+1-Sy) # d = 2
+    Es = np.mean(np.abs(points)**2)
+    gamma_s = np.asarray(gamma_s,dtype=float)
+    q = 0.5*erfc(sqrt(gamma_s/Es)) # Q(d/2sigma), sigma^2 = Es/(2gamma_s)
+    Pe = 1-(1-np.multiply.outer(a,q))*(1-np.multiply.outer(b,q)) # rectangular regions
+    done = {} # the 8 symmetries of the cross map equivalent points onto each other
+    for i in np.nonzero(nearCorner)[0]:
+        key = tuple(sorted((abs(points[i].real),abs(points[i].imag))))
+        if key not in done:
+            done[key] = voronoi_error(points,i,Es/(2*gamma_s))
+        Pe[i] = done[key]
+    SERs = np.mean(Pe,axis=0)
+    return SERs
+
+def voronoi_error(points,i,sigma2,n=48):
+    """
+    Probability that complex Gaussian noise takes a point out of its minimum
+    distance decision (Voronoi) region
+    
+    The region of points[i] is the polygon cut out by the bisectors with all
+    the other points (unbounded sides are closed far away). Seen from the
+    point, the noise leaves the region with probability
+    1/(2pi) int exp(-rho(theta)^2/(2sigma^2)) dtheta, rho(theta) the distance
+    to the boundary in the direction theta (Craig's form). Over the angular
+    sector of a side at distance h with normal angle phi, rho = h/cos(theta-phi)
+    and the smooth integrand is integrated with an n point Gauss-Legendre rule.
+    Parameters:
+        points : complex constellation points
+        i : index of the transmitted point
+        sigma2 : noise variance per dimension (scalar or array)
+        n : Gauss-Legendre nodes per side of the region
+    Returns:
+        Pe = probability of a symbol error for each value of sigma2
+    """
+    p = points[i]
+    R = 1e6*np.max(np.abs(points-p)) # far box closing the unbounded sides
+    poly = [R*(1+1j)*1j**k for k in range(4)] # counterclockwise, centred on p
+    for z in np.delete(points,i)-p: # keep the half plane Re(w conj(z)) <= |z|^2/2
+        (h,clipped) = (abs(z)**2/2,[])
+        for (u,v) in zip(poly,poly[1:]+poly[:1]): # Sutherland-Hodgman
+            (fu,fv) = ((u*z.conjugate()).real-h,(v*z.conjugate()).real-h)
+            if fu<=0:
+                clipped.append(u)
+            if fu*fv<0: # the side crosses the bisector
+                clipped.append(u+(v-u)*fu/(fu-fv))
+        poly = clipped
+    sigma2 = np.asarray(sigma2,dtype=float)
+    (x,w) = np.polynomial.legendre.leggauss(n)
+    Pe = np.zeros(sigma2.shape)
+    for (u,v) in zip(poly,poly[1:]+poly[:1]):
+        e = v-u
+        f = u-e*(u*e.conjugate()).real/abs(e)**2 # foot of the perpendicular
+        h = abs(f)
+        if h>R/2: # side of the far box
+            continue
+        (psiA,psiB) = (np.angle(u/f),np.angle(v/f)) # sector relative to the normal
+        psi = (psiA+psiB)/2+(psiB-psiA)/2*x
+        g = np.exp(-np.multiply.outer(h**2/(2*sigma2),1/np.cos(psi)**2))
+        Pe += (psiB-psiA)/2*np.dot(g,w)/(2*pi)
+    return Pe
+
+def apsk_awgn(M,gamma_s):
+    """
+    Theoretical Symbol Error Rates (union bound) for APSK over AWGN, for the
+    default ring ratios of modem.APSKModem
+    Parameters:
+        M : Modulation level, 16 or 32
+        gamma_s : list of snr per symbol
+    Returns:
+        SERs = list of symbol error rates (upper bound, tight at high SNR)
+    """
+    from .modem import APSKModem
+    return union_bound_awgn(APSKModem(M).constellation,gamma_s)
+
+def union_bound_awgn(constellation,gamma_s):
+    """
+    Union bound on the Symbol Error Rate of an arbitrary constellation over AWGN
+    
+    SER <= 1/M sum_i sum_j!=i Q(d_ij/sqrt(2N0)), with N0 = Es/gamma_s. The
+    pairwise distances are reduced to their distance spectrum (distinct
+    distances and multiplicities), then evaluated for every SNR at once.
+    Parameters:
+        constellation : reference constellation (equiprobable points)
+        gamma_s : list of snr per symbol
+    Returns:
+        SERs = list of symbol error rates (upper bound, clipped to 1)
+    """
+    from scipy.special import erfc
+    c = np.asarray(constellation)
+    M = len(c)
+    Es = np.mean(np.abs(c)**2) # average symbol energy
+    d = np.abs(c[:,None]-c[None,:])[~np.eye(M,dtype=bool)] # pairwise distances
+    (dist,count) = np.unique(np.round(d/sqrt(Es),12),return_counts=True) # spectrum
+    N0 = 1/np.asarray(gamma_s) # noise density relative to Es
+    SERs = np.sum(count[:,None]/M*0.5*erfc(dist[:,None]/(2*sqrt(N0))),axis=0)
+    return np.minimum(SERs,1)
+
+def pam_awgn(M,gamma_s):
+    """
+    Theoretical Symbol Error Rates for PAM over AWGN
+    Parameters:
+        M : Modulation level for the chosen modulation.
+            For PAM, M can be any power of 2.
+        gamma_s : list of snr per symbol
+    Returns:
+        SERs = list of symbol error rates
+    """
+    from scipy.special import erfc
+    SERs=2*(1-1/M)*0.5*erfc(sqrt(3*gamma_s/(M**2-1)))
+    return SERs
+
+def integrand(q,gamma_s,M):
+    """
+    Compute the integrand used for computing symbol error rates for coherent FSK        
+    Parameters:
+    q : represents the variable q in the above equation
+    gamma_s : list of snr per symbol 
+    M : Modulation level for the chosen modulation.
+        For FSK, M can be any power of 2.
+    Returns:
+        The computed equation as a function
+    """
+    from scipy.special import erfc
+    return (0.5*erfc((-q-np.sqrt(2*gamma_s))/np.sqrt(2)))**(M-1)\
+        *1/np.sqrt(2*pi)*np.exp(-(q**2)/2)
+
+def mode_quadrature(logf,dlogf,lo,hi,n=64,errorBound=False,lower=None,width=10):
+    """
+    Integrals of log-concave functions exp(logf(u)), many at once
+    
+    The mode u* of each log integrand is located by bisection on its
+    derivative inside (lo,hi) and the width s of the integrand is taken from
+    the curvature of the log integrand there. Over the whole real line
+    (lower=None) an n-point Gauss-Hermite rule is centred on u* and scaled by s
+    (a Laplace approximation corrected by the quadrature). For integrands that
+    vanish below a bound (lower) an n-point Gauss-Legendre rule is used on the
+    window (max(u*-width*s,lower), u*+width*s). The integrand is only handled
+    through its logarithm, so tiny or huge values do not underflow or overflow
+    before the final sum.
+    Parameters:
+        logf : log of the integrands, vectorized: logf(u) for an array u whose
+               last axis holds the nodes
+        dlogf : derivative of logf
+        lo, hi : arrays with dlogf(lo) > 0 >= dlogf(hi) (one per integral)
+        n : number of quadrature nodes
+        errorBound : True = also return an error estimate
+        lower : lower end of the integration range, default None = -infinity
+        width : half width of the Gauss-Legendre window in units of s
+    Returns:
+        I = integrals (shape of lo)
+        err = (only if errorBound=True) relative error estimate of every
+              integral, the difference between the n-point and 2n-point rules
+    """
+    (lo,hi) = (np.asarray(lo,dtype=float)[...,None],np.asarray(hi,dtype=float)[...,None])
+    for _ in range(60): # bisection for the mode u*
+        mid = (lo+hi)/2
+        up = dlogf(mid)>0
+        lo = np.where(up,mid,lo); hi = np.where(up,hi,mid)
+    u0 = (lo+hi)/2
+    h = 1e-3*np.maximum(1,np.abs(u0)) # curvature at the mode by central differences
+    curv = (dlogf(u0+h)-dlogf(u0-h))/(2*h)
+    scale = 1/np.sqrt(np.maximum(-curv,1e-12)) # width of the integrand
+    if lower is None:
+        def rule(n): # Gauss-Hermite rule centred on the mode
+            (t,w) = np.polynomial.hermite.hermgauss(n)
+            u = u0+sqrt(2)*scale*t
+            return sqrt(2)*scale[...,0]*np.sum(w*np.exp(logf(u)+t**2),axis=-1)
+    else:
+        (A,B) = (np.maximum(u0-width*scale,lower),u0+width*scale) # window
+        def rule(n): # Gauss-Legendre rule on the window
+            (t,w) = np.polynomial.legendre.leggauss(n)
+            L = logf((A+B)/2+(B-A)/2*t)
+            m = np.max(L,axis=-1,keepdims=True) # factored out against underflow
+            return ((B-A)/2*np.exp(m))[...,0]*np.sum(w*np.exp(L-m),axis=-1)
+    I = rule(n)
+    if errorBound:
+        err = np.abs(I-rule(2*n))/np.maximum(I,np.finfo(float).tiny)
+        return (I,err)
+    return I
+
+def fsk_coherent_awgn(M,gamma_s_vals,n=64,errorBound=False):
+    """
+    Theoretical Symbol Error Rates for coherent FSK over AWGN, vectorized
+    
+    SER = integral of phi(u-a)*(1-Phi(u)^(M-1)) du with a = sqrt(2*gamma_s),
+    evaluated for all SNR points (and M values) at once with a Gauss-Hermite
+    rule centred on its mode (mode_quadrature). The integrand is log-concave and is computed in the
+    log domain (1-Phi^(M-1) = -expm1((M-1)*log_ndtr(u))), so there is no
+    cancellation at high SNR and no overflow for large M.
+    Parameters:
+        M : Modulation level for FSK modulation (any M >= 2), scalar or array
+        gamma_s_vals: list of snr per symbol
+        n : number of Gauss-Hermite nodes
+        errorBound : True = also return an error estimate
+    Returns:
+        SERs = list of symbol error rates (len(M) x len(gamma_s_vals) for an
+               array M)
+        err = (only if errorBound=True) relative error estimate of every point,
+              the difference between the n-point and the 2n-point rules
+    """
+    from scipy.special import log_ndtr
+    M = np.asarray(M,dtype=float)[...,None,None] # extra axes: SNR, nodes
+    a = sqrt(2*np.asarray(gamma_s_vals,dtype=float))[...,None]
+    logPhi = lambda u: -u**2/2-0.5*np.log(2*pi) # log of the normal pdf
+    def logS(u): # log(1-Phi(u)^(M-1))
+        x = (M-1)*log_ndtr(u)
+        tail = np.log(M-1)+log_ndtr(-u) # (M-1)Q(u), used once x underflows
+        return np.where(x>-1e-10,tail,np.log(-np.expm1(np.minimum(x,-1e-10))))
+    logf = lambda u: logPhi(u-a)+logS(u) # log of the integrand
+    def dlogf(u): # derivative of the log of the integrand
+        return -(u-a)-np.exp(np.log(M-1)+logPhi(u)+(M-2)*log_ndtr(u)-logS(u))
+    (lo,hi) = np.broadcast_arrays(-10.0,(a+0*M)[...,0]) # dlogf(lo) > 0 >= dlogf(hi)
+    out = mode_quadrature(logf,dlogf,lo,hi,n,errorBound)
+    (SERs,err) = out if errorBound else (out,None)
+    SERs = np.minimum(SERs,1-1/M[...,0]) # never above the error of a random guess
+    return (SERs,err) if errorBound else SERs
+
+def fsk_noncoherent_awgn(M,gamma_s_vals,n=64,errorBound=False):
+    """
+    Theoretical Symbol Error Rates for noncoherent FSK over AWGN, vectorized
+    
+    Integral form of the alternating binomial sum, which cancels
+    catastrophically for large M in floating point however the binomials are
+    computed. With a = sqrt(2*gamma_s), the envelope r of the correct branch is
+    Rician and the M-1 others are Rayleigh, so
+    SER = integral over r>0 of r*exp(-(r^2+a^2)/2)*I0(a*r)*(1-(1-exp(-r^2/2))^(M-1)).
+    The log of the integrand is evaluated without cancellation (log1p/expm1,
+    exponentially scaled Bessel functions) and integrated for all SNR points
+    (and M values) at once with a Gauss-Legendre rule around its mode
+    (mode_quadrature).
+    Parameters:
+        M : Modulation level for FSK modulation (any M >= 2), scalar or array
+        gamma_s_vals: list of snr per symbol
+        n : number of Gauss-Legendre nodes
+        errorBound : True = also return an error estimate
+    Returns:
+        SERs = list of symbol error rates (len(M) x len(gamma_s_vals) for an
+               array M)
+        err = (only if errorBound=True) relative error estimate of every point,
+              the difference between the n-point and the 2n-point rules
+    """
+    from scipy.special import i0e,i1e
+    M = np.asarray(M,dtype=float)[...,None,None] # extra axes: SNR, nodes
+    a = sqrt(2*np.asarray(gamma_s_vals,dtype=float))[...,None]
+    def logF(r): # log(1-exp(-r^2/2)), Rayleigh CDF of the other branches
+        y = r**2/2
+        return np.where(y>np.log(2),np.log1p(-np.exp(-y)),
+                        np.log(-np.expm1(-np.minimum(y,np.log(2)))))
+    def logS(r): # log(1-(1-exp(-r^2/2))^(M-1))
+        x = (M-1)*logF(r)
+        tail = np.log(M-1)-r**2/2 # (M-1)exp(-r^2/2), used once x underflows
+        return np.where(x>-1e-10,tail,np.log(-np.expm1(np.minimum(x,-1e-10))))
+    def logf(r): # log of the integrand (Rician pdf x probability of error)
+        with np.errstate(divide='ignore'): # log(0) = -inf at r = 0
+            return np.log(r)-(r-a)**2/2+np.log(i0e(a*r))+logS(r)
+    def dlogf(r): # derivative of the log of the integrand
+        dS = -np.exp(np.log(M-1)+(M-2)*logF(r)+np.log(r)-r**2/2-logS(r))
+        return 1/r-(r-a)+a*(i1e(a*r)/i0e(a*r)-1)+dS
+    (lo,hi) = np.broadcast_arrays(1e-8,(a+10+0*M)[...,0]) # dlogf(lo) > 0 >= dlogf(hi)
+    out = mode_quadrature(logf,dlogf,lo,hi,n,errorBound,lower=0)
+    (SERs,err) = out if errorBound else (out,None)
+    SERs = np.minimum(SERs,1-1/M[...,0]) # never above the error of a random guess
+    return (SERs,err) if errorBound else SERs
+
+def fsk_awgn(M_val,gamma_s_vals,coherence,method='vectorized'):
+    """
+    Theoretical Symbol Error Rates for FSK over AWGN
+    Parameters:
+        M_val : Modulation level for FSK modulation.
+            For FSK, M can be any power of 2.
+        gamma_s_vals: list of snr per symbol 
+        coherence: 'coherent' for coherent FSK detection
+                    'noncoherent' for noncoherent FSK detection
+        method: 'vectorized' (default) for fsk_coherent_awgn and
+                fsk_noncoherent_awgn, or the reference per-point evaluation:
+                'quad' (coherent) or 'sympy' (noncoherent)
+    Returns:
+        SERs = list of symbol error rates
+    """
+    SERs = np.zeros(len(gamma_s_vals))
+    if coherence.lower()=='coherent' and method=='vectorized':
+        SERs = fsk_coherent_awgn(M_val,gamma_s_vals)
+    elif coherence.lower()=='noncoherent' and method=='vectorized':
+        SERs = fsk_noncoherent_awgn(M_val,gamma_s_vals)
+    elif coherence.lower()=='coherent':
+        from scipy.integrate import quad
+        for j,gamma_s in enumerate(gamma_s_vals):
+            (y,_) =  quad(integrand,-np.inf,np.inf,(gamma_s,M_val))
+            SERs[j] = 1- y
+    elif coherence.lower()=='noncoherent':
+        #use SymPy - symbolic mathematics for evaluating the SER equations
+        from sympy import symbols,Symbol,Sum,exp,binomial,erfc,integrate,oo,sqrt
+        M,i = symbols('M i', integer=True, positive=True)
+        gamma = Symbol('gamma')
+        s = Sum((-1)**(i+1)/(i+1)*binomial(M-1,i)*exp(-i/(i+1)*gamma),(i,1,M-1))
+        for j,gamma_s in enumerate(gamma_s_vals):
+            #evaluate the expression with values for M and gamma_s
+            SERs[j] = s.evalf(subs={M:M_val,gamma:gamma_s})
+    else:
+        raise ValueError('For FSK coherence must be \'coherent\' or \'noncoherent\'')
+    return SERs
+
+def ser_rayleigh(EbN0dBs,mod_type=None,M=0):
+    """
+    Theoretical Symbol Error Rates for various modulations over noise added Rayleigh
+    flat-fading channel
+    Parameters:
+        EbN0dBs : list of SNR per bit values in dB scale
+        mod_type : 'PSK','QAM','PAM'
+        M : Modulation level for the chosen modulation.
+            For PSK,PAM M can be any power of 2.
+            For QAM M must be even power of 2 (square QAM only)
+    Returns:
+        SERs = list of symbol error rates
+    """
+    if mod_type==None:
+        raise ValueError('Invalid value for mod_type')
+    if (M<2) or ((M & (M -1))!=0): #if M not a power of 2
+        raise ValueError('M should be a power of 2')    
+    func_dict = {'psk': psk_rayleigh,'qam':qam_rayleigh,'pam':pam_rayleigh}    
+    gamma_s_vals = log2(M)*(10**(EbN0dBs/10))
+    return func_dict[mod_type.lower()](M,gamma_s_vals) #call appropriate function
+
+def mgf_rayleigh(g,gamma_s): 
+    """
+    Used to compute MGF function for Rayleigh flat-fading channel
+    Parameters:
+        g: represents the variable 'g' in the MGF equation 
+        gamma_s : list of snr per symbol
+    Returns:
+        The MGF function
+    """
+    fun = lambda x: 1/(1+(g*gamma_s/(sin(x)**2))) # MGF function
+    return fun        
+
+def psk_rayleigh(M,gamma_s_vals):
+    """
+    Theoretical Symbol Error Rates for PSK over noise added Rayleigh
+    flat-fading channel
+    Parameters:
+        M : Modulation level for the chosen modulation.
+            For PSK, M can be any power of 2.
+        gamma_s_vals: list of snr per symbol
+    Returns:
+        SERs = list of symbol error rates
+    """
+    gamma_b = gamma_s_vals/log2(M)
+    if (M==2):
+        SERs = 0.5*(1-sqrt(gamma_b/(1+gamma_b)))
+    else: # MGF integral for all SNR points at once
+        SERs = mgf_average(mgf_rayleigh,'psk',M,gamma_s_vals)
+    return SERs
+
+def qam_rayleigh(M,gamma_s_vals):
+    """
+    Theoretical Symbol Error Rates for square QAM over noise added Rayleigh
+    flat-fading channel
+    Parameters:
+        M : Modulation level for the chosen modulation.
+            For QAM, M must be an even power of 2 (square QAM only).
+        gamma_s_vals: list of snr per symbol
+    Returns:
+        SERs = list of symbol error rates
+    """
+    if (M==1) or (np.mod(np.log2(M),2)!=0): # M not a even power of 2
+        raise ValueError('Only square MQAM supported. M must be even power of 2')    
+    return mgf_average(mgf_rayleigh,'qam',M,gamma_s_vals) # all SNR points at once
+
+def pam_rayleigh(M,gamma_s_vals):
+    """
+    Theoretical Symbol Error Rates for PAM over noise added Rayleigh
+    flat-fading channel
+    Parameters:
+        M : Modulation level for the chosen modulation.
+            For PAM, M can be any power of 2.
+        gamma_s_vals: list of snr per symbol
+    Returns:
+        SERs = list of symbol error rates
+    """
+    return mgf_average(mgf_rayleigh,'pam',M,gamma_s_vals) # all SNR points at once
+
+def ser_rician(K_dB,EbN0dBs,mod_type=None,M=0):
+    """
+    Theoretical Symbol Error Rates for various modulations over noise added Rician
+    flat-fading channel
+    Parameters:
+        K_dB: Rician K-factor in dB, scalar or array of K factors
+        EbN0dBs : list of SNR per bit values in dB scale
+        mod_type : 'PSK','QAM','PAM'
+        M : Modulation level for the chosen modulation.
+            For PSK,PAM M can be any power of 2.
+            For QAM M must be even power of 2 (square QAM only)
+    Returns:
+        SERs = Symbol Error Rates (len(K_dB) x len(EbN0dBs) for an array K_dB)
+    """
+    if mod_type==None:
+        raise ValueError('Invalid value for mod_type')
+    if (M<2) or ((M & (M -1))!=0): #if M not a power of 2
+        raise ValueError('M should be a power of 2')
+    
+    func_dict = {'psk': psk_rician,'qam':qam_rician,'pam':pam_rician}
+    gamma_s_vals = log2(M)*(10**(EbN0dBs/10))
+    #call appropriate function
+    return func_dict[mod_type.lower()](K_dB,M,gamma_s_vals)
+
+def mgf_rician(K_dB,g,gamma_s): 
+    """
+    Used to compute MGF function for Rician flat-fading channel
+    Parameters:
+        K_dB: list of Rician K factors in dB
+        g: represents the variable 'g' in the MGF equation 
+        gamma_s : list of snr per symbol
+    Returns:
+        The MGF function
+    """
+    K = 10**(K_dB/10) # K factor in linear scale
+    fun = lambda x: ((1+K)*sin(x)**2)/((1+K)*sin(x)**2+g*gamma_s)\
+          *exp(-K*g*gamma_s/((1+K)*sin(x)**2+g*gamma_s)) # MGF function
+    return fun #return the MGF function
+
+def psk_rician(K_dB,M,gamma_s_vals):
+    """
+    Theoretical Symbol Error Rates for PSK over noise added Rician flat-fading channel
+    Parameters:
+        K_dB: list of Rician K factors in dB
+        M : Modulation level for the chosen modulation.
+            For PSK, M can be any power of 2.
+        gamma_s_vals: list of snr per symbol
+    Returns:
+        SERs = list of symbol error rates
+    """
+    # MGF integral for all SNR points (and K factors) at once, also for M=2
+    mgf = lambda g,gamma_s: mgf_rician(np.asarray(K_dB,dtype=float)[...,None,None],g,gamma_s)
+    return mgf_average(mgf,'psk',M,gamma_s_vals)
+
+def qam_rician(K_dB,M,gamma_s_vals):
+    """
+    Theoretical Symbol Error Rates for QAM over noise added Rician flat-fading channel
+    Parameters:
+        K_dB: list of Rician K factors in dB
+        M : Modulation level for the chosen modulation.
+            For QAM, M must be an even power of 2 (square QAM only).
+        gamma_s_vals: list of snr per symbol
+    Returns:
+        SERs = list of symbol error rates
+    """
+    if (M==1) or (np.mod(np.log2(M),2)!=0): # M not a even power of 2
+        raise ValueError('Only square MQAM supported. M must be even power of 2')
+    # MGF integrals for all SNR points (and K factors) at once
+    mgf = lambda g,gamma_s: mgf_rician(np.asarray(K_dB,dtype=float)[...,None,None],g,gamma_s)
+    return mgf_average(mgf,'qam',M,gamma_s_vals)
+
+def pam_rician(K_dB,M,gamma_s_vals):
+    """
+    Theoretical Symbol Error Rates for PAM over noise added Rician flat-fading channel
+    Parameters:
+        K_dB: list of Rician K factors in dB
+        M : Modulation level for the chosen modulation.
+            For PAM, M can be any power of 2.
+        gamma_s_vals: list of snr per symbol
+    Returns:
+        SERs = list of symbol error rates
+    """
+    # MGF integral for all SNR points (and K factors) at once
+    mgf = lambda g,gamma_s: mgf_rician(np.asarray(K_dB,dtype=float)[...,None,None],g,gamma_s)
+    return mgf_average(mgf,'pam',M,gamma_s_vals)
+
+def ser_nakagami(m,EbN0dBs,mod_type=None,M=0):
+    """
+    Theoretical Symbol Error Rates for various modulations over noise added
+    Nakagami-m flat-fading channel
+    Parameters:
+        m : Nakagami fading parameter (m>=0.5, m=1 is Rayleigh), scalar or
+            array of m values
+        EbN0dBs : list of SNR per bit values in dB scale
+        mod_type : 'PSK','QAM','PAM'
+        M : Modulation level for the chosen modulation.
+            For PSK,PAM M can be any power of 2.
+            For QAM M must be even power of 2 (square QAM only)
+    Returns:
+        SERs = list of symbol error rates (len(m) x len(EbN0dBs) for an array m)
+    """
+    m = np.asarray(m,dtype=float)
+    if np.any(m<0.5):
+        raise ValueError('The Nakagami parameter m must be >= 0.5')
+    return ser_mgf(lambda g,gamma_s: mgf_nakagami(m[...,None,None],g,gamma_s),
+                   EbN0dBs,mod_type,M)
+
+def mgf_nakagami(m,g,gamma_s):
+    """
+    Used to compute MGF function for Nakagami-m flat-fading channel
+    Parameters:
+        m : Nakagami fading parameter
+        g: represents the variable 'g' in the MGF equation 
+        gamma_s : list of snr per symbol
+    Returns:
+        The MGF function
+    """
+    fun = lambda x: (1+g*gamma_s/(m*sin(x)**2))**(-m) # MGF function
+    return fun
+
+def ser_shadowing(sigma_dB,EbN0dBs,mod_type=None,M=0):
+    """
+    Theoretical Symbol Error Rates for various modulations over noise added
+    composite Rayleigh/log-normal shadowing (Suzuki) flat-fading channel
+    Parameters:
+        sigma_dB : standard deviation of the shadowing in dB, scalar or array
+        EbN0dBs : list of average SNR per bit values in dB scale
+        mod_type : 'PSK','QAM','PAM'
+        M : Modulation level for the chosen modulation.
+            For PSK,PAM M can be any power of 2.
+            For QAM M must be even power of 2 (square QAM only)
+    Returns:
+        SERs = list of symbol error rates (len(sigma_dB) x len(EbN0dBs) for an
+               array sigma_dB)
+    """
+    sigma_dB = np.asarray(sigma_dB,dtype=float)
+    return ser_mgf(lambda g,gamma_s: mgf_shadowing(sigma_dB[...,None,None],g,gamma_s),
+                   EbN0dBs,mod_type,M)
+
+def mgf_shadowing(sigma_dB,g,gamma_s,n=64):
+    """
+    Used to compute MGF function for composite Rayleigh/log-normal shadowing
+    
+    The local mean power Omega is log-normal with E[Omega] = 1, and given
+    Omega the fading is Rayleigh, so the MGF is E[1/(1+g*gamma_s*Omega/sin^2)],
+    averaged over Omega with an n-point Gauss-Hermite rule.
+    Parameters:
+        sigma_dB : standard deviation of the shadowing in dB
+        g: represents the variable 'g' in the MGF equation 
+        gamma_s : list of average snr per symbol
+        n : number of Gauss-Hermite nodes
+    Returns:
+        The MGF function
+    """
+    (t,w) = np.polynomial.hermite.hermgauss(n)
+    s = np.asarray(sigma_dB)[...,None]*np.log(10)/10 # std. dev. of ln(Omega)
+    Omega = exp(sqrt(2)*s*t-s**2/2) # log-normal power levels, unit mean
+    gamma = np.asarray(gamma_s)[...,None] # extra axis for the Hermite nodes
+    fun = lambda x: np.sum(w/(1+g*gamma*Omega/sin(np.asarray(x)[...,None])**2),axis=-1)/sqrt(pi)
+    return fun
+
+def ser_mgf(mgf,EbN0dBs,mod_type=None,M=0,n=64):
+    """
+    Theoretical Symbol Error Rates for various modulations from the MGF of
+    the fading, for the whole SNR grid at once (see mgf_average)
+    Parameters:
+        mgf : function (g,gamma_s) returning the MGF function of x, e.g.
+              lambda g,gamma_s: mgf_nakagami(2,g,gamma_s)
+        EbN0dBs : list of SNR per bit values in dB scale
+        mod_type : 'PSK','QAM','PAM'
+        M : Modulation level for the chosen modulation.
+            For PSK,PAM M can be any power of 2.
+            For QAM M must be even power of 2 (square QAM only)
+        n : number of Gauss-Legendre nodes
+    Returns:
+        SERs = list of symbol error rates (extra leading axes of the fading
+               parameters of mgf come first)
+    """
+    if mod_type==None:
+        raise ValueError('Invalid value for mod_type')
+    if (M<2) or ((M & (M -1))!=0): #if M not a power of 2
+        raise ValueError('M should be a power of 2')
+    gamma_s_vals = log2(M)*(10**(np.asarray(EbN0dBs,dtype=float)/10))
+    return mgf_average(mgf,mod_type,M,gamma_s_vals,n)
+
+def mgf_average(mgf,mod_type,M,gamma_s_vals,n=64):
+    """
+    Fading-averaged Symbol Error Rates of PSK/QAM/PAM by the MGF approach,
+    with a fixed Gauss-Legendre rule
+    
+    The integrands over the angle x are smooth on finite intervals, so an
+    n-point Gauss-Legendre rule is accurate. The MGF function is called once
+    on a (fading parameters x SNR x nodes) grid: the nodes on the last axis,
+    the SNRs on the axis before it, and any array-valued fading parameters
+    of mgf (e.g. K factors placed on a leading axis) broadcast in front.
+    Parameters:
+        mgf : function (g,gamma_s) returning the MGF function of x
+        mod_type : 'PSK','QAM','PAM'
+        M : Modulation level for the chosen modulation
+        gamma_s_vals : list of snr per symbol
+        n : number of Gauss-Legendre nodes
+    Returns:
+        SERs = list of symbol error rates
+    """
+    (t,w) = np.polynomial.legendre.leggauss(n)
+    gamma_s = np.asarray(gamma_s_vals,dtype=float)[:,None] # axis for the nodes
+    def integral(fun,b): # integral of fun over (0,b)
+        return b/2*np.sum(w*fun(b/2*(t+1)),axis=-1)
+    mod_type = mod_type.lower()
+    if mod_type=='psk':
+        fun = mgf((sin(pi/M))**2,gamma_s)
+        SERs = (1/pi)*integral(fun,pi*(M-1)/M)
+    elif mod_type=='qam':
+        if (M==1) or (np.mod(np.log2(M),2)!=0): # M not a even power of 2
+            raise ValueError('Only square MQAM supported. M must be even power of 2')
+        fun = mgf(1.5/(M-1),gamma_s)
+        SERs = 4/pi*(1-1/sqrt(M))*integral(fun,pi/2)-4/pi*(1-1/sqrt(M))**2*integral(fun,pi/4)
+    elif mod_type=='pam':
+        fun = mgf(3/(M**2-1),gamma_s)
+        SERs = 2*(M-1)/(M*pi)*integral(fun,pi/2)
+    else:
+        raise ValueError('Invalid value for mod_type')
+    return SERs
@@ -0,0 +1,38 @@
+"""
+digimod: modems, channel models and theoretical error rates used by the
+simulation scripts of this repository (Error_Rates_PSK, Error_Rates_QAM, ...)
+
+Modules:
+    modem : Modem base class, PSK/QAM/PAM/FSK modems and the getModem factory
+    channels : AWGN, flat-fading (Rayleigh, Rician, Nakagami-m, shadowing) and
+               multipath channel models
+    impairments : RF impairment stages (CFO, phase noise, IQ imbalance, DC
+                  offset, AWGN) that can be chained and streamed
+    fixedpoint : fixed-point (int16/int8) interleaved I/Q samples, saturating
+                 quantization and AWGN with ADC quantization
+    ErrorRates : theoretical symbol error rates over AWGN/Rayleigh/Rician/
+                 Nakagami-m/log-normal shadowing
+    sercache : in-process and on-disk cache of the theoretical SER curves
+    sertable : interpolated SER lookup tables (forward and inverse) for fast
+               queries, memory-mappable
+
+Random draws: every function or class taking rng accepts a
+numpy.random.Generator or a seed, and rng=None (the default) draws from the
+global numpy.random state, directly or through a Generator seeded from it
+(channels.generator), so np.random.seed makes any run reproducible.
+
+Heavy dependencies are imported only by the functions that need them
+(matplotlib for plotting, scipy for the error rate integrals, sympy only for
+the reference noncoherent FSK evaluation), so importing the package costs
+little more than numpy.
+"""
+from .modem import Modem,PSKModem,QAMModem,PAMModem,FSKModem,getModem,countBitErrors
+from .channels import (awgn,awgnInto,awgnSweep,rayleighFading,ricianFading,nakagamiFading,
+                       shadowedFading,fadingChannel,fadingSweep,spawnGenerators,
+                       JakesFading,MultipathChannel)
+from .impairments import (CarrierOffset,PhaseNoise,IQImbalance,DCOffset,AdditiveNoise,
+                          ImpairmentChain)
+from .fixedpoint import qFormat,quantize,dequantize,saturatingAdd,awgnFixed
+from .ErrorRates import ser_awgn,ser_rayleigh,ser_rician,ser_nakagami,ser_shadowing
+from .sercache import SERCache,ser_cached
+from .sertable import SERTable,serTable
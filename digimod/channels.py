@@ -0,0 +1,647 @@
+from numpy import (sum,isrealobj,sqrt,finfo,float64,complex64,complex128,result_type,
+                   add,divide,absolute,empty,empty_like,multiply,
+                   asarray,vdot,shares_memory,pi,arange,cos,sin,exp,mod,concatenate,
+                   rint,zeros,nonzero,ceil,log,log2,broadcast_to,stack,diff)
+from numpy.fft import fft,ifft
+from numpy.lib.stride_tricks import sliding_window_view
+from numpy.random import (standard_normal,standard_gamma,random_sample,default_rng,Generator,
+                          SeedSequence,PCG64,Philox,randint)
+
+def generator(rng=None):
+    """
+    numpy.random.Generator for rng: a seed or Generator goes through
+    default_rng (a Generator is returned as is), and None gives a new
+    Generator seeded from the global numpy.random state, so np.random.seed
+    also makes the draws that need a Generator reproducible
+    """
+    if rng is None:
+        return default_rng(randint(0,2**32,size=4,dtype='uint64'))
+    return default_rng(rng)
+
+def spawnGenerators(seed,n,bitGenerator='PCG64'):
+    """
+    Independent, reproducible random streams for parallel simulations
+    
+    The streams are spawned from one SeedSequence, so they are statistically
+    independent and fully determined by (seed, n). Give stream i to chunk i
+    of a simulation (not to worker i): the result is then bit-identical
+    whether the chunks run serially or are spread over any number of
+    processes.
+    Parameters:
+        seed : integer seed (or SeedSequence) of the whole simulation
+        n : number of streams (chunks) to spawn
+        bitGenerator : 'PCG64' (default) or 'Philox'
+    Returns:
+        rngs : list of n numpy.random.Generator objects
+    """
+    bitGenerators = {'pcg64':PCG64,'philox':Philox}
+    if bitGenerator.lower() not in bitGenerators:
+        raise ValueError('bitGenerator must be \'PCG64\' or \'Philox\'')
+    if not isinstance(seed,SeedSequence):
+        seed = SeedSequence(seed)
+    bitGen = bitGenerators[bitGenerator.lower()]
+    return [Generator(bitGen(child)) for child in seed.spawn(n)]
+
+def gaussianNoise(shape,dtype=float64,rng=None):
+    """
+    Standard normal samples drawn directly in the requested float type
+    (float32 samples are generated as float32, never as float64 and cast).
+    With rng=None, float64 samples come from the global numpy.random state and
+    float32 samples from a Generator seeded from it (see generator);
+    otherwise all samples are drawn from the numpy.random.Generator rng.
+    """
+    if rng is not None:
+        return rng.standard_normal(shape,dtype=finfo(dtype).dtype)
+    if finfo(dtype).dtype==float64:
+        return standard_normal(shape)
+    return generator().standard_normal(shape,dtype=dtype)
+
+def awgn(s,SNRdB,L=1,rng=None):
+    """
+    AWGN channel
+    
+    Add AWGN noise to input signal. The function adds AWGN noise vector to signal
+    's' to generate a resulting signal vector 'r' of specified SNR in dB. It also
+    returns the noise vector 'n' that is added to the signal 's' and the power
+    spectral density N0 of noise added. The noise is generated in the precision
+    of 's': a complex64/float32 input gives a complex64/float32 output.
+    
+    Parameters:
+        s : input/transmitted signal vector
+        SNRdB : desired signal to noise ratio (expressed in dB)
+            for the received signal
+        L : oversampling factor (applicable for waveform simulation)
+            default L = 1.
+        rng : numpy.random.Generator (or seed) for the noise,
+              default None = global numpy.random state
+    Returns:
+        r : received signal vector (r=s+n)
+    """
+    gamma = 10**(SNRdB/10) #SNR to linear scale
+    if rng is not None:
+        rng = default_rng(rng) # a seed becomes one Generator for all draws
+    ftype = finfo(s.dtype).dtype # real type matching the precision of s
+    
+    if s.ndim==1:# if s is single dimensional vector
+        P=L*sum(abs(s)**2)/len(s) #Actual power in the vector
+    else: # multi-dimensional signals like MFSK
+        P=L*sum(sum(abs(s)**2))/len(s) # if s is a matrix [MxN]
+        
+    N0=P/gamma # Find the noise spectral density    
+    scale = ftype.type(sqrt(N0/2)) # noise std. dev. in the precision of s
+    if isrealobj(s):# check if input is real/complex object type
+        n = scale*gaussianNoise(s.shape,ftype,rng) # computed noise
+    else:
+        n = scale*(gaussianNoise(s.shape,ftype,rng)+1j*gaussianNoise(s.shape,ftype,rng))
+    r = s + n # received signal    
+    return r
+
+def awgnInto(s,SNRdB,out=None,scratch=None,L=1,P=None,rng=None):
+    """
+    Allocation-free AWGN channel
+    
+    Same channel as awgn, written into preallocated buffers. The signal power
+    is computed with vdot (no abs(s)**2 temporary) unless P is given, the real
+    and imaginary noise are drawn straight into the interleaved float view of
+    the complex buffer with Generator.standard_normal(out=...), and scaling
+    and addition are done in place. When out does not overlap s no other
+    memory is touched; when out is s itself (in-place channel) the noise is
+    drawn into scratch first. The noise samples are drawn in a different order
+    than in awgn, so the two functions give different (equally distributed)
+    noise for the same seed.
+    
+    Parameters:
+        s : input/transmitted signal vector (C-contiguous)
+        SNRdB : desired signal to noise ratio (expressed in dB)
+        out : output buffer, same shape and dtype as s (may be s itself)
+              default None = allocated
+        scratch : noise buffer like s, only used when out overlaps s
+                  default None = allocated when needed
+        L : oversampling factor, default L = 1.
+        P : known power of s, default None = measured from s
+        rng : numpy.random.Generator (or seed) for the noise,
+              default None = global numpy.random state
+    Returns:
+        out : received signal vector (r=s+n)
+    """
+    s = asarray(s)
+    if out is None:
+        out = empty_like(s)
+    if (out.shape!=s.shape) or (out.dtype!=s.dtype) or not out.flags.c_contiguous:
+        raise ValueError('out must be a C-contiguous array with the shape and dtype of s')
+    rng = generator(rng)
+    ftype = finfo(s.dtype).dtype # real type matching the precision of s
+    if P is None:
+        P = vdot(s,s).real/len(s) # actual power (per row for matrices)
+    N0 = L*P/10**(SNRdB/10) # noise spectral density
+    n = out
+    if shares_memory(out,s): # in-place: the signal is needed after the draw
+        if scratch is None:
+            scratch = empty_like(s)
+        if (scratch.shape!=s.shape) or (scratch.dtype!=s.dtype) or not scratch.flags.c_contiguous:
+            raise ValueError('scratch must be a C-contiguous array with the shape and dtype of s')
+        n = scratch
+    rng.standard_normal(dtype=ftype,out=n.reshape(-1).view(ftype)) # re and im in place
+    n *= ftype.type(sqrt(N0/2)) # noise std. dev. per dimension
+    if n is out:
+        out += s
+    else:
+        out += n
+    return out
+
+def awgnSweep(s,SNRdBs,L=1,P=None,rng=None):
+    """
+    AWGN channel for an SNR sweep (common random numbers)
+    
+    Draws unit variance noise once for the whole signal, then produces the
+    received signal for each SNR in SNRdBs by scaling that noise and adding
+    the signal into one reused buffer. Compared with one awgn call per SNR
+    point, there is a single noise draw and at most one signal power pass,
+    and the points of the sweep share the same noise, so the variance
+    between neighbouring SNR points is much smaller. With the same rng, the
+    first point equals awgn(s,SNRdBs[0],L,rng).
+    
+    Parameters:
+        s : input/transmitted signal vector
+        SNRdBs : signal to noise ratios (expressed in dB) of the sweep
+        L : oversampling factor (applicable for waveform simulation)
+            default L = 1.
+        P : known power of s (e.g. the mean energy of the constellation)
+            default None = measured from s
+        rng : numpy.random.Generator (or seed) for the noise,
+              default None = global numpy.random state
+    Yields:
+        r : received signal vector (r=s+n) for each SNR in turn. The same
+            array is overwritten at the next step, copy it to keep it.
+    """
+    if rng is not None:
+        rng = default_rng(rng) # a seed becomes one Generator for all draws
+    ftype = finfo(s.dtype).dtype # real type matching the precision of s
+    if P is None:
+        P = sum(abs(s)**2)/len(s) # actual power (per row for matrices)
+    P = L*P
+    if isrealobj(s):
+        n = gaussianNoise(s.shape,ftype,rng) # unit variance noise
+    else:
+        n = gaussianNoise(s.shape,ftype,rng)+1j*gaussianNoise(s.shape,ftype,rng)
+    r = empty(s.shape,dtype=n.dtype) # received signal buffer
+    for SNRdB in SNRdBs:
+        N0 = P/10**(SNRdB/10) # noise spectral density for this SNR
+        multiply(n,ftype.type(sqrt(N0/2)),out=r)
+        r += s
+        yield r
+
+def fadingChannel(s,SNRdB,K_dB=None,L=1,P=None,csi=False,rng=None,maxBytes=2**24):
+    """
+    Flat-fading channel with AWGN and zero-forcing equalization, fused
+    
+    Every symbol goes through its own complex fading gain h (Rayleigh, or
+    Rician with K_dB) and AWGN, and the equalized sample r/h = s + n/h is
+    returned, ready for Modem.demodulate (for flat fading, minimum distance
+    detection of r/h is the coherent ML decision). Fading gains and noise are
+    drawn block by block into two reused buffers, so h, h*s, n and r are never
+    built for the whole vector. E|h|^2 = 1 and the SNR is the average SNR per
+    symbol, as in ErrorRates.ser_rayleigh/ser_rician. Gains and noise are
+    drawn alternately per block, so for a given seed the realisation also
+    depends on maxBytes.
+    
+    Parameters:
+        s : input/transmitted signal vector
+        SNRdB : average signal to noise ratio (expressed in dB)
+        K_dB : Rician K factor in dB, default None = Rayleigh fading
+        L : oversampling factor, default L = 1.
+        P : known power of s, default None = measured from s
+        csi : True = also return the channel state information
+        rng : numpy.random.Generator (or seed) for the fading and the noise,
+              default None = global numpy.random state
+        maxBytes : memory budget in bytes of each buffer
+    Returns:
+        r : equalized received vector (r = s + n/h), complex
+        N0eff : (only if csi=True) noise power N0/|h|^2 of every equalized
+                sample, to be passed as N0 to Modem.llrDemapper
+    """
+    s = asarray(s)
+    N = len(s)
+    ctype = result_type(s.dtype,complex64) # complex type matching s
+    ftype = finfo(ctype).dtype
+    rng = generator(rng)
+    if P is None:
+        P = vdot(s,s).real/N # actual power in the vector
+    N0 = L*P/10**(SNRdB/10) # noise spectral density
+    K = 0 if K_dB is None else 10**(K_dB/10) # K factor in linear scale
+    mu = ftype.type(sqrt(K/(2*(K+1)))) # mean of each quadrature (line of sight)
+    sigma = ftype.type(sqrt(1/(2*(K+1)))) # std. dev. of each quadrature
+    scale = ftype.type(sqrt(N0/2)) # noise std. dev. per dimension
+    r = empty(N,dtype=ctype)
+    if csi:
+        N0eff = empty(N,dtype=ftype)
+    B = int(max(1,min(N,maxBytes//ctype.itemsize))) # samples per block
+    (h,w) = (empty(B,dtype=ctype),empty(B,dtype=ctype)) # fading and noise buffers
+    for start in range(0,N,B):
+        stop = min(start+B,N)
+        (hb,wb) = (h[:stop-start],w[:stop-start])
+        rng.standard_normal(dtype=ftype,out=hb.view(ftype)) # complex fading gains
+        hb *= sigma
+        hb += mu*(1+1j)
+        rng.standard_normal(dtype=ftype,out=wb.view(ftype)) # complex noise
+        wb *= scale
+        wb /= hb # n/h
+        add(s[start:stop],wb,out=r[start:stop])
+        if csi:
+            g = N0eff[start:stop]
+            absolute(hb,out=g)
+            g *= g # |h|^2
+            divide(ftype.type(N0),g,out=g)
+    if csi:
+        return (r,N0eff)
+    return r
+
+def fadingSweep(s,SNRdBs,K_dBs=None,L=1,P=None,csi=False,rng=None):
+    """
+    fadingChannel for a sweep of K factors and SNRs (common random numbers)
+    
+    The unit complex Gaussian fading draws and the unit noise are generated
+    once. For each K factor the gains h and n/h are formed once, then each SNR
+    point only rescales n/h and adds the signal into a reused buffer. Memory
+    stays at a few vectors of len(s) whatever the size of the sweep. With the
+    same rng and a single block, the first point equals (up to rounding)
+    fadingChannel(s,SNRdBs[0],K_dBs[0],L,P,csi,rng).
+    
+    Parameters:
+        s : input/transmitted signal vector
+        SNRdBs : average signal to noise ratios (expressed in dB)
+        K_dBs : Rician K factors in dB (None in the list = Rayleigh fading)
+                default None = Rayleigh fading only
+        L : oversampling factor, default L = 1.
+        P : known power of s, default None = measured from s
+        csi : True = also yield N0/|h|^2 of every sample
+        rng : numpy.random.Generator (or seed),
+              default None = global numpy.random state
+    Yields:
+        r : equalized received vector for each (K_dB, SNRdB), K factors in
+            the outer loop and SNRs in the inner loop, or (r, N0eff) when
+            csi=True. The arrays are overwritten at the next step.
+    """
+    s = asarray(s)
+    N = len(s)
+    ctype = result_type(s.dtype,complex64) # complex type matching s
+    ftype = finfo(ctype).dtype
+    rng = generator(rng)
+    if P is None:
+        P = vdot(s,s).real/N # actual power in the vector
+    if K_dBs is None:
+        K_dBs = [None]
+    (g,w) = (empty(N,dtype=ctype),empty(N,dtype=ctype))
+    rng.standard_normal(dtype=ftype,out=g.view(ftype)) # unit fading draws
+    rng.standard_normal(dtype=ftype,out=w.view(ftype)) # unit noise
+    (q,r) = (empty(N,dtype=ctype),empty(N,dtype=ctype))
+    if csi:
+        (h2,N0eff) = (empty(N,dtype=ftype),empty(N,dtype=ftype))
+    for K_dB in K_dBs:
+        K = 0 if K_dB is None else 10**(K_dB/10) # K factor in linear scale
+        multiply(g,ftype.type(sqrt(1/(2*(K+1)))),out=q) # h = sigma*g + mu(1+j)
+        q += ftype.type(sqrt(K/(2*(K+1))))*(1+1j)
+        if csi:
+            absolute(q,out=h2)
+            h2 *= h2 # |h|^2
+        divide(w,q,out=q) # unit noise over h
+        for SNRdB in SNRdBs:
+            N0 = L*P/10**(SNRdB/10) # noise spectral density
+            multiply(q,ftype.type(sqrt(N0/2)),out=r)
+            r += s
+            if csi:
+                divide(ftype.type(N0),h2,out=N0eff)
+                yield (r,N0eff)
+            else:
+                yield r
+
+def rayleighFading(N,dtype=float64,rng=None):
+    """
+    Generate Rayleigh flat-fading channel samples
+    Parameters:
+        N : number of samples to generate
+        dtype : float64 (default) or float32 for single precision samples
+        rng : numpy.random.Generator (or seed),
+              default None = global numpy.random state
+    Returns:
+        abs_h : Rayleigh flat fading samples
+    """
+    if rng is not None:
+        rng = default_rng(rng)
+    # 1 tap complex gaussian filter
+    h = finfo(dtype).dtype.type(1/sqrt(2))*(gaussianNoise(N,dtype,rng)+1j*gaussianNoise(N,dtype,rng))
+    return abs(h)
+
+def ricianFading(K_dB,N,dtype=float64,rng=None):
+    """
+    Generate Rician flat-fading channel samples
+    
+    K_dB may be an array of K factors: all of them are then built from the same
+    2N Gaussian draws (common random numbers), one row per K factor, so a
+    K sweep costs one noise generation plus a rescaling per K.
+    Parameters:
+        K_dB: Rician K factor in dB scale, scalar or array of K factors
+        N : number of samples to generate
+        dtype : float64 (default) or float32 for single precision samples
+        rng : numpy.random.Generator (or seed),
+              default None = global numpy.random state
+    Returns:
+        abs_h : Rician flat fading samples, N values for a scalar K_dB,
+                len(K_dB) x N array otherwise
+    """
+    if rng is not None:
+        rng = default_rng(rng)
+    ftype = finfo(dtype).dtype
+    K = 10**(asarray(K_dB,dtype=float64)/10) # K factor in linear scale
+    mu = sqrt(K/(2*(K+1))).astype(ftype)[...,None] # mean
+    sigma = sqrt(1/(2*(K+1))).astype(ftype)[...,None] # sigma
+    (x,y) = (gaussianNoise(N,ftype,rng),gaussianNoise(N,ftype,rng)) # shared draws
+    h = (sigma*x+mu)+1j*(sigma*y+mu)
+    return abs(h)
+
+def nakagamiFading(m,N,dtype=float64,rng=None):
+    """
+    Generate Nakagami-m flat-fading channel samples
+    
+    |h|^2 is Gamma distributed with shape m and mean 1 (m=1 gives Rayleigh,
+    m=0.5 one-sided Gaussian, large m approaches no fading).
+    Parameters:
+        m : Nakagami fading parameter (m>=0.5)
+        N : number of samples to generate
+        dtype : float64 (default) or float32 for single precision samples
+        rng : numpy.random.Generator (or seed),
+              default None = global numpy.random state
+    Returns:
+        abs_h : Nakagami-m flat fading samples
+    """
+    if m<0.5:
+        raise ValueError('The Nakagami parameter m must be >= 0.5')
+    ftype = finfo(dtype).dtype
+    if rng is not None:
+        g = default_rng(rng).standard_gamma(m,N,dtype=ftype)
+    elif ftype==float64:
+        g = standard_gamma(m,N)
+    else:
+        g = generator().standard_gamma(m,N,dtype=ftype)
+    g *= ftype.type(1/m) # unit mean power
+    return sqrt(g,out=g)
+
+def shadowedFading(sigma_dB,N,dtype=float64,rng=None):
+    """
+    Generate composite Rayleigh/log-normal shadowing (Suzuki) channel samples
+    
+    Rayleigh fading whose local mean power Omega is log-normal with a standard
+    deviation of sigma_dB in dB, normalised so that E|h|^2 = E[Omega] = 1.
+    Parameters:
+        sigma_dB : standard deviation of the shadowing in dB
+        N : number of samples to generate
+        dtype : float64 (default) or float32 for single precision samples
+        rng : numpy.random.Generator (or seed),
+              default None = global numpy.random state
+    Returns:
+        abs_h : composite fading samples
+    """
+    if rng is not None:
+        rng = default_rng(rng)
+    ftype = finfo(dtype).dtype
+    s = sigma_dB*log(10)/10 # std. dev. of ln(Omega)
+    h = rayleighFading(N,ftype,rng)
+    h *= exp(ftype.type(s/2)*gaussianNoise(N,ftype,rng)-ftype.type(s**2/4)) # sqrt(Omega)
+    return h
+
+class JakesFading:
+    # Time-correlated (Doppler) flat-fading channel, sum-of-sinusoids model
+    # (Zheng & Xiao). Complex gains h with E|h|^2 = 1 and autocorrelation
+    # close to J0(2*pi*fd*tau) (Rayleigh), optionally plus a line-of-sight
+    # component (Rician). The generator is resumable: each call to generate()
+    # continues the same realisation, so arbitrarily long fading sequences can
+    # be streamed chunk by chunk with constant memory.
+    #   fd : maximum Doppler frequency in Hz
+    #   Ts : sampling period in seconds
+    #   nSinusoids : sinusoids per quadrature component (default 16)
+    #   K_dB : Rician K factor in dB, default None = Rayleigh fading
+    #   losAngle : angle of arrival of the line of sight in radians (Rician)
+    #   rng : numpy.random.Generator (or seed) for the random angles and phases,
+    #         default None = global numpy.random state
+    #   dtype : complex128 (default) or complex64 for the returned gains
+    blockMemory = 2**24 # memory budget in bytes of one block of generate()
+    
+    def __init__(self,fd,Ts,nSinusoids=16,K_dB=None,losAngle=0.0,rng=None,dtype=complex128):
+        if nSinusoids<1:
+            raise ValueError('nSinusoids must be a positive integer')
+        draw = random_sample if rng is None else default_rng(rng).random
+        (theta,phiI,phiQ,phiLOS) = (2*pi*draw(1)-pi,2*pi*draw(nSinusoids),
+                                    2*pi*draw(nSinusoids),2*pi*draw(1))
+        wd = 2*pi*fd*Ts # maximum Doppler in radians per sample
+        alpha = (2*pi*arange(1,nSinusoids+1)-pi+theta)/(4*nSinusoids) # arrival angles
+        # angular frequency and current phase of every sinusoid: I terms, Q terms
+        self.omega = concatenate((wd*cos(alpha),wd*sin(alpha)))
+        self.phases = concatenate((phiI,phiQ))
+        self.nSinusoids = nSinusoids
+        self.K = 0.0 if K_dB is None else 10**(K_dB/10) # K factor in linear scale
+        self.losOmega = wd*cos(losAngle) # Doppler shift of the line of sight
+        self.losPhase = float(phiLOS[0])
+        self.dtype = dtype
+    
+    def generate(self,N):
+        """
+        Next N complex fading gains of the realisation
+        
+        The N x 2*nSinusoids phases are evaluated in blocks bounded by
+        blockMemory. The phase of each sinusoid is carried over (modulo 2*pi)
+        to the next call, so consecutive calls give one continuous sequence.
+        Parameters:
+            N : number of samples to generate
+        Returns:
+            h : complex fading gains (E|h|^2 = 1)
+        """
+        L = self.nSinusoids
+        h = empty(N,dtype=self.dtype)
+        B = int(max(1,min(N,self.blockMemory//(16*L)))) # samples per block
+        scatter = sqrt(1/(L*(1+self.K))) # diffuse power 1/(K+1)
+        los = sqrt(self.K/(1+self.K)) # line of sight power K/(K+1)
+        for start in range(0,N,B):
+            stop = min(start+B,N)
+            n = arange(stop-start,dtype=float64)
+            c = cos(multiply.outer(n,self.omega)+self.phases) # block x 2L
+            hI = sum(c[:,:L],axis=1); hQ = sum(c[:,L:],axis=1)
+            g = scatter*(hI+1j*hQ)
+            if self.K>0:
+                g += los*exp(1j*(self.losOmega*n+self.losPhase))
+            h[start:stop] = g
+            # carry the phases over to the next block
+            self.phases = mod(self.phases+(stop-start)*self.omega,2*pi)
+            self.losPhase = float(mod(self.losPhase+(stop-start)*self.losOmega,2*pi))
+        return h
+
+class MultipathChannel:
+    # Frequency-selective tapped-delay-line (TDL) channel
+    # 
+    # The power-delay profile is mapped onto sample-spaced taps (paths falling
+    # on the same sample add their powers) and normalised to unit total power.
+    # Each tap is a complex Gaussian gain: fixed for the whole stream when
+    # fd=None (block fading), or varying with a JakesFading process per tap,
+    # updated once per block of `hop` samples, when a Doppler fd is given.
+    # Long streams are filtered with overlap-save FFT convolution, many blocks
+    # at a time, and the channel keeps its state (last L-1 inputs, current
+    # taps, position in the current block) between calls to filter(), so a
+    # stream cut into chunks of any size gives the same output.
+    #   delays : path delays in seconds (in samples with Ts=1)
+    #   powers_dB : path powers in dB
+    #   Ts : sampling period in seconds, default 1
+    #   fd : maximum Doppler frequency in Hz, default None = static taps
+    #   nfft : FFT size of the overlap-save blocks
+    #          default None = power of 2 >= max(1024,16L)
+    #   rng : numpy.random.Generator (or seed) for the taps,
+    #         default None = global numpy.random state
+    #   dtype : complex128 (default) or complex64 for the output
+    blockMemory = 2**24 # memory budget in bytes of one group of FFT blocks
+    # standard LTE profiles (3GPP TS 36.104): delays in seconds, powers in dB
+    profiles = {'EPA':((0,30e-9,70e-9,90e-9,110e-9,190e-9,410e-9),
+                       (0.0,-1.0,-2.0,-3.0,-8.0,-17.2,-20.8)),
+                'EVA':((0,30e-9,150e-9,310e-9,370e-9,710e-9,1090e-9,1730e-9,2510e-9),
+                       (0.0,-1.5,-1.4,-3.6,-0.6,-9.1,-7.0,-12.0,-16.9)),
+                'ETU':((0,50e-9,120e-9,200e-9,230e-9,500e-9,1600e-9,2300e-9,5000e-9),
+                       (-1.0,-1.0,-1.0,0.0,0.0,0.0,-3.0,-5.0,-7.0))}
+    
+    def __init__(self,delays,powers_dB,Ts=1.0,fd=None,nfft=None,rng=None,dtype=complex128):
+        d = rint(asarray(delays,dtype=float64)/Ts).astype(int) # delays in samples
+        powers = 10**(asarray(powers_dB,dtype=float64)/10)
+        if (d.shape!=powers.shape) or (d.min()<0):
+            raise ValueError('delays and powers_dB must have the same length, delays >= 0')
+        L = int(d.max())+1 # number of sample-spaced taps
+        pdp = zeros(L)
+        add.at(pdp,d,powers) # paths on the same sample add their powers
+        self.pdp = pdp/sum(pdp) # unit total power
+        self.active = nonzero(self.pdp)[0] # taps carrying power
+        if nfft is None:
+            nfft = 2**int(ceil(log2(max(1024,16*L))))
+        if nfft<2*L:
+            raise ValueError('nfft must be at least twice the channel length')
+        self.nfft = nfft
+        self.hop = nfft-L+1 # new output samples per block
+        self.L = L
+        self.dtype = dtype
+        if rng is not None:
+            rng = default_rng(rng)
+        if fd is None: # block fading: one complex gain per tap
+            self.fading = None
+            g = gaussianNoise(len(self.active),float64,rng)+1j*gaussianNoise(len(self.active),float64,rng)
+            self.taps = self.tapVector(sqrt(1/2)*g[None,:])[0]
+        else: # one Jakes process per tap, sampled once per block
+            seeds = None if rng is None else rng.integers(0,2**63,len(self.active))
+            self.fading = [JakesFading(fd,self.hop*Ts,rng=None if seeds is None else seeds[i])
+                           for i in range(len(self.active))]
+            self.taps = self.nextTaps(1)[0]
+        self.reset()
+    
+    @classmethod
+    def fromProfile(cls,name,Ts,**kwargs):
+        """
+        TDL channel with a standard power-delay profile ('EPA','EVA','ETU')
+        Parameters:
+            name : profile name
+            Ts : sampling period in seconds
+            kwargs : other MultipathChannel arguments (fd, nfft, rng, dtype)
+        Returns:
+            channel : MultipathChannel instance
+        """
+        if name.upper() not in cls.profiles:
+            raise ValueError('Unknown profile: '+str(name))
+        (delays,powers_dB) = cls.profiles[name.upper()]
+        return cls(delays,powers_dB,Ts,**kwargs)
+    
+    @classmethod
+    def exponential(cls,nTaps,decay_dB,**kwargs):
+        """
+        TDL channel with an exponential power-delay profile
+        Parameters:
+            nTaps : number of sample-spaced taps
+            decay_dB : power decay in dB from one tap to the next
+            kwargs : other MultipathChannel arguments (fd, nfft, rng, dtype)
+        Returns:
+            channel : MultipathChannel instance
+        """
+        return cls(arange(nTaps),-decay_dB*arange(nTaps),1.0,**kwargs)
+    
+    def reset(self):
+        """
+        Clear the filter memory (start a new stream with the current taps)
+        """
+        self.history = zeros(self.L-1,dtype=complex128) # last L-1 inputs
+        self.offset = 0 # samples already output in the current block
+    
+    def tapVector(self,g):
+        """
+        Sample-spaced tap vectors from the gains of the active taps
+        Parameters:
+            g : n x (number of active taps) unit power complex gains
+        Returns:
+            taps : n x L tap vectors scaled by the power-delay profile
+        """
+        taps = zeros((len(g),self.L),dtype=complex128)
+        taps[:,self.active] = g*sqrt(self.pdp[self.active])
+        return taps
+    
+    def nextTaps(self,n):
+        """
+        Tap vectors of the next n blocks
+        Parameters:
+            n : number of blocks
+        Returns:
+            taps : n x L tap vectors
+        """
+        if self.fading is None:
+            return broadcast_to(self.taps,(n,self.L))
+        g = stack([f.generate(n) for f in self.fading],axis=1)
+        return self.tapVector(g)
+    
+    def filter(self,x):
+        """
+        Pass the next chunk of a stream through the channel
+        
+        The chunk is cut at the block boundaries of the stream; every segment
+        is convolved with the taps of its block by overlap-save (each FFT frame
+        holds the L-1 previous inputs followed by the segment). Groups of
+        segments are transformed together with 2-D FFTs, the group size being
+        bounded by blockMemory.
+        Parameters:
+            x : input samples (real or complex)
+        Returns:
+            y : output samples, len(y) = len(x)
+        """
+        x = asarray(x)
+        N = len(x); L = self.L; nfft = self.nfft; hop = self.hop
+        y = empty(N,dtype=self.dtype)
+        if N==0:
+            return y
+        # inputs preceded by the memory, zero padded so every frame is complete
+        z = concatenate((self.history,x,zeros(nfft,dtype=x.dtype)))
+        frames = sliding_window_view(z,nfft)
+        # segment boundaries aligned with the blocks of the whole stream
+        first = min(N,hop-self.offset)
+        starts = concatenate(([0],arange(first,N,hop))).astype(int)
+        lengths = diff(concatenate((starts,[N])))
+        if self.fading is None:
+            H = fft(self.taps,nfft)[None,:] # same taps for every block
+        G = int(max(1,self.blockMemory//(3*16*nfft))) # segments per group
+        for g0 in range(0,len(starts),G):
+            s = starts[g0:g0+G]; n = lengths[g0:g0+G]
+            if self.fading is not None:
+                # the first segment of the call continues the current block
+                taps = self.nextTaps(len(s)-(g0==0))
+                if g0==0:
+                    taps = concatenate((self.taps[None,:],taps))
+                self.taps = taps[-1]
+                H = fft(taps,nfft,axis=1)
+            # frame = L-1 previous inputs + segment: the last nfft-L+1 outputs
+            # of the circular convolution are the linear convolution
+            Y = ifft(fft(frames[s],axis=1)*H,axis=1)[:,L-1:]
+            y[s[0]:s[-1]+n[-1]] = Y[arange(hop)<n[:,None]] # segments back to back
+        # update the state: position in the block, taps, last inputs
+        self.offset = (self.offset+N) if len(starts)==1 else int(lengths[-1])
+        if self.offset==self.hop: # the block is complete, move to the next one
+            self.taps = self.nextTaps(1)[0]
+            self.offset = 0
+        self.history = z[N:N+L-1].astype(complex128) # last L-1 inputs
+        return y
@@ -0,0 +1,117 @@
+import numpy as np
+from .channels import generator
+
+# Fixed-point I/Q samples are carried as interleaved integer arrays: an N x 2
+# array of int16 (or int8) with the I sample in column 0 and the Q sample in
+# column 1, in a Q-format with fracBits fractional bits (integer value =
+# round(x*2^fracBits)). Every conversion saturates to the range of the type.
+
+def qFormat(peak,dtype=np.int16,headroom_dB=6):
+    """
+    Largest number of fractional bits for which a component of magnitude
+    peak, amplified by headroom_dB (margin for the noise), does not saturate
+    Parameters:
+        peak : largest |I| or |Q| of the signal (e.g. of the constellation)
+        dtype : int16 (default) or int8
+        headroom_dB : margin above peak in dB
+    Returns:
+        fracBits : number of fractional bits
+    """
+    limit = np.iinfo(dtype).max/(peak*10**(headroom_dB/20))
+    if limit<1:
+        raise ValueError('peak does not fit in '+np.dtype(dtype).name)
+    return int(np.floor(np.log2(limit)))
+
+def quantize(x,fracBits,dtype=np.int16):
+    """
+    Complex samples to interleaved fixed-point I/Q (ADC quantization)
+    Parameters:
+        x : complex (or real) samples
+        fracBits : number of fractional bits of the Q-format
+        dtype : int16 (default), int8 or any integer type
+    Returns:
+        q : len(x) x 2 integer array (I,Q), rounded to nearest and saturated
+    """
+    x = np.asarray(x)
+    info = np.iinfo(dtype)
+    q = np.empty(x.shape+(2,),dtype=dtype)
+    for (k,part) in ((0,np.real),(1,np.imag)):
+        v = np.rint(part(x)*2.0**fracBits) # scale to the Q-format
+        np.clip(v,info.min,info.max,out=v) # saturate
+        q[...,k] = v
+    return q
+
+def dequantize(q,fracBits,dtype=np.complex64):
+    """
+    Interleaved fixed-point I/Q back to complex samples
+    Parameters:
+        q : len x 2 integer array (I,Q)
+        fracBits : number of fractional bits of the Q-format
+        dtype : complex64 (default) or complex128
+    Returns:
+        x : complex samples
+    """
+    ftype = np.finfo(dtype).dtype
+    x = np.empty(q.shape[:-1],dtype=dtype)
+    scale = ftype.type(2.0**-fracBits)
+    np.multiply(q[...,0],scale,out=x.real)
+    np.multiply(q[...,1],scale,out=x.imag)
+    return x
+
+def saturatingAdd(a,b,out=None):
+    """
+    Saturating addition of two fixed-point arrays of the same Q-format
+    (computed in a wider integer type, then clipped to the range of a)
+    Parameters:
+        a, b : integer arrays (b may be broadcast)
+        out : output array, default None = new array of the type of a
+    Returns:
+        out : a+b saturated to the range of the type of a
+    """
+    info = np.iinfo(a.dtype)
+    s = np.add(a,b,dtype=np.int64 if info.bits>16 else np.int32)
+    np.clip(s,info.min,info.max,out=s)
+    if out is None:
+        return s.astype(a.dtype)
+    out[...] = s
+    return out
+
+def awgnFixed(q,SNRdB,fracBits,P=None,rng=None,out=None,maxBytes=2**22):
+    """
+    AWGN channel for fixed-point I/Q followed by ADC quantization
+    
+    The samples are processed in blocks: each block is converted to float32,
+    noise is added and the result is quantized back to the Q-format with
+    saturation, so the float working set is bounded by maxBytes.
+    Parameters:
+        q : len x 2 integer array (I,Q) of the transmitted samples
+        SNRdB : desired signal to noise ratio (expressed in dB)
+        fracBits : number of fractional bits of the Q-format
+        P : known power of the signal (in signal units, not LSBs)
+            default None = measured from q
+        rng : numpy.random.Generator (or seed),
+              default None = global numpy.random state
+        out : output integer array like q (may be q itself)
+              default None = new array
+        maxBytes : memory budget in bytes of the float block
+    Returns:
+        out : received samples, quantized (len x 2, type of q)
+    """
+    rng = generator(rng)
+    if P is None: # mean of I^2+Q^2, accumulated in integers
+        P = float(np.einsum('ij,ij->',q,q,dtype=np.int64))/len(q)/4.0**fracBits
+    if out is None:
+        out = np.empty_like(q)
+    info = np.iinfo(q.dtype)
+    N0 = P/10**(SNRdB/10) # noise spectral density
+    sigma = np.float32(np.sqrt(N0/2)*2.0**fracBits) # noise std. dev. in LSBs
+    B = int(max(1,maxBytes//8)) # samples (I,Q float32 pairs) per block
+    for start in range(0,len(q),B):
+        stop = min(start+B,len(q))
+        v = rng.standard_normal((stop-start,2),dtype=np.float32)
+        v *= sigma
+        v += q[start:stop] # analog received signal in LSB units
+        np.rint(v,out=v) # ADC: round and saturate
+        np.clip(v,info.min,info.max,out=v)
+        out[start:stop] = v
+    return out
@@ -0,0 +1,163 @@
+import numpy as np
+from .channels import gaussianNoise,awgnInto
+
+class Impairment:
+    # Base class of the RF impairment stages
+    # Each stage transforms a chunk of complex baseband samples in place and
+    # keeps whatever state it needs (running phase, ...) between chunks, so a
+    # stream cut into chunks of any size goes through the same impairment.
+    blockMemory = 2**22 # memory budget in bytes of the temporaries of a stage
+    
+    def __call__(self,x):
+        """
+        Apply the impairment to the next chunk of the stream
+        Parameters:
+            x : complex baseband samples, modified in place when x is a
+                complex array (any other input is converted to the complex
+                type of its precision: float32 -> complex64, else complex128)
+        Returns:
+            y : impaired samples (x itself when processed in place)
+        """
+        x = np.asarray(x)
+        if not np.iscomplexobj(x):
+            x = x.astype(np.result_type(x.dtype,np.complex64))
+        B = int(max(1,self.blockMemory//x.itemsize)) # samples per block
+        for start in range(0,len(x),B):
+            self.process(x[start:start+B])
+        return x
+    
+    def process(self,x):
+        """
+        Impair one block in place (implemented by the stages)
+        """
+        raise NotImplementedError
+    
+    def reset(self):
+        """
+        Forget the state carried between chunks (stateless stages: no-op)
+        """
+        pass
+
+class CarrierOffset(Impairment):
+    # Carrier frequency offset: x[n] exp(j(2 pi df Ts n + phase))
+    #   df : frequency offset in Hz (in cycles per sample with Ts=1)
+    #   Ts : sampling period in seconds, default 1
+    #   phase : initial carrier phase in radians
+    def __init__(self,df,Ts=1.0,phase=0.0):
+        self.omega = 2*np.pi*df*Ts # phase increment per sample
+        self.phase0 = phase
+        self.reset()
+    
+    def process(self,x):
+        phi = self.phase+self.omega*np.arange(len(x)) # float64 phase ramp
+        x *= np.exp(1j*phi).astype(x.dtype,copy=False)
+        self.phase = np.mod(self.phase+self.omega*len(x),2*np.pi) # running phase
+    
+    def reset(self):
+        self.phase = self.phase0
+
+class PhaseNoise(Impairment):
+    # Wiener (random walk) phase noise of an oscillator with a Lorentzian
+    # spectrum: phase increments of variance 2 pi beta Ts per sample
+    #   linewidth : two-sided 3 dB linewidth beta in Hz
+    #   Ts : sampling period in seconds, default 1
+    #   rng : numpy.random.Generator (or seed),
+    #         default None = global numpy.random state
+    def __init__(self,linewidth,Ts=1.0,rng=None):
+        self.sigma = np.sqrt(2*np.pi*linewidth*Ts) # std. dev. of the increments
+        self.rng = None if rng is None else np.random.default_rng(rng)
+        self.reset()
+    
+    def process(self,x):
+        phi = gaussianNoise(len(x),np.float64,self.rng)
+        phi *= self.sigma
+        np.cumsum(phi,out=phi)
+        phi += self.phase # continue the walk of the previous block
+        x *= np.exp(1j*phi).astype(x.dtype,copy=False)
+        if len(x):
+            self.phase = np.mod(phi[-1],2*np.pi)
+    
+    def reset(self):
+        self.phase = 0.0
+
+class IQImbalance(Impairment):
+    # Receiver IQ gain/phase imbalance: y = mu x + nu conj(x) with
+    # mu = (1 + g exp(-j phi))/2 and nu = (1 - g exp(j phi))/2
+    #   gain_dB : amplitude imbalance g in dB (Q branch relative to I)
+    #   phase_deg : phase imbalance phi in degrees
+    def __init__(self,gain_dB,phase_deg):
+        g = 10**(gain_dB/20); phi = np.deg2rad(phase_deg)
+        self.mu = (1+g*np.exp(-1j*phi))/2
+        self.nu = (1-g*np.exp(1j*phi))/2
+        # the same map on (I,Q) as a real 2x2 matrix
+        (mu,nu) = (self.mu,self.nu)
+        self.A = np.array([[mu.real+nu.real,nu.imag-mu.imag],
+                           [mu.imag+nu.imag,mu.real-nu.real]])
+    
+    def process(self,x):
+        (I,Q) = (x.real,x.imag) # views into x
+        i0 = I.copy()
+        I *= self.A[0,0]
+        I += self.A[0,1]*Q
+        Q *= self.A[1,1]
+        Q += self.A[1,0]*i0
+
+class DCOffset(Impairment):
+    # Constant complex DC offset added to the samples
+    #   offset : complex DC level
+    def __init__(self,offset):
+        self.offset = offset
+    
+    def process(self,x):
+        x += self.offset
+
+class AdditiveNoise(Impairment):
+    # AWGN as a stage of a chain (channels.awgnInto, in place). Strided
+    # (non-contiguous) blocks go through a contiguous work buffer.
+    #   SNRdB : signal to noise ratio (expressed in dB)
+    #   P : known signal power (e.g. the mean energy of the constellation),
+    #       default None = measured on every block
+    #   rng : numpy.random.Generator (or seed),
+    #         default None = global numpy.random state
+    def __init__(self,SNRdB,P=None,rng=None):
+        self.SNRdB = SNRdB
+        self.P = P
+        self.rng = None if rng is None else np.random.default_rng(rng)
+        self.scratch = None
+        self.work = None
+    
+    def buffer(self,name,x):
+        """
+        Reused buffer of at least len(x) samples of the type of x
+        """
+        b = getattr(self,name)
+        if (b is None) or (len(b)<len(x)) or (b.dtype!=x.dtype):
+            b = np.empty(len(x),dtype=x.dtype)
+            setattr(self,name,b)
+        return b[:len(x)]
+    
+    def process(self,x):
+        scratch = self.buffer('scratch',x) # noise buffer
+        if x.flags.c_contiguous:
+            awgnInto(x,self.SNRdB,out=x,scratch=scratch,P=self.P,rng=self.rng)
+        else: # awgnInto needs contiguous buffers
+            work = self.buffer('work',x)
+            work[...] = x
+            awgnInto(work,self.SNRdB,out=work,scratch=scratch,P=self.P,rng=self.rng)
+            x[...] = work
+
+class ImpairmentChain(Impairment):
+    # Stages applied one after the other, e.g.
+    #   chain = ImpairmentChain(CarrierOffset(100,1e-6),PhaseNoise(50,1e-6),
+    #                           IQImbalance(0.5,3),DCOffset(0.01),AdditiveNoise(20))
+    #   r = chain(modem.modulate(syms))
+    def __init__(self,*stages):
+        self.stages = list(stages)
+    
+    def process(self,x):
+        for stage in self.stages: # every stage on the same block, in place
+            stage.process(x)
+    
+    def reset(self):
+        for stage in self.stages:
+            stage.reset()
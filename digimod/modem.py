@@ -0,0 +1,940 @@
+import numpy as np
+import abc
+from functools import lru_cache
+from .channels import gaussianNoise
+from .fixedpoint import quantize
+
+def logSumExp(x):
+    """
+    Row-wise log(sum(exp(x))) with the row maximum factored out, so large
+    arguments neither overflow nor underflow
+    """
+    xmax = np.max(x,axis=1)
+    return xmax+np.log(np.sum(np.exp(x-xmax[:,None]),axis=1))
+
+def bitLLR(metric,bitLabels,nBits,method='exact',out=None):
+    """
+    Bit log-likelihood ratios from the log-likelihoods of candidate points
+    
+    For each bit b: LLR(b) = log(sum exp(metric_s) over points s with b=0)
+                           - log(sum exp(metric_s) over points s with b=1)
+    The 'maxlog' approximation keeps only the largest term of each sum:
+    LLR(b) = max(metric_s, b=0) - max(metric_s, b=1)
+    
+    Parameters:
+        metric : N x L log-likelihoods of the L candidate points, up to a
+                 constant common to each row (ex: -|r-s|^2/N0)
+        bitLabels : integer bit label of each of the L candidate points
+        nBits : number of bits in each label
+        method : 'exact' for log-sum-exp or 'maxlog' for max-log
+        out : optional N x nBits array to write the result into
+    Returns:
+        llrs : N x nBits LLRs (MSB first), positive values favour bit 0
+    """
+    if method not in ('exact','maxlog'):
+        raise ValueError('method must be \'exact\' or \'maxlog\'')
+    if out is None:
+        out = np.empty((metric.shape[0],nBits),dtype=metric.dtype)
+    for b in range(nBits):
+        bit = (bitLabels>>(nBits-1-b))&1 # b-th bit of every label, MSB first
+        (m0,m1) = (metric[:,bit==0],metric[:,bit==1])
+        if method=='maxlog':
+            out[:,b] = np.max(m0,axis=1)-np.max(m1,axis=1)
+        else:
+            out[:,b] = logSumExp(m0)-logSumExp(m1)
+    return out
+
+POPCOUNT = np.array([bin(x).count('1') for x in range(256)],dtype=np.uint8) # bits set per byte
+
+def packWords(words,k):
+    """
+    Pack k-bit words into a np.packbits style uint8 buffer (MSB first)
+    
+    For k <= 8, groups of lcm(k,8)/k words fill exactly lcm(k,8)/8 bytes, so
+    each group is assembled in a 64-bit integer with shifts and split back
+    into bytes. Larger words are expanded to bits and packed with np.packbits.
+    Parameters:
+        words : integer words in the range 0 to 2^k-1
+        k : number of bits in each word
+    Returns:
+        packedBits : uint8 buffer of ceil(k*len(words)/8) bytes
+    """
+    words = np.asarray(words)
+    nBytes = (k*len(words)+7)//8
+    if k > 8:
+        bits = (words[:,None]>>np.arange(k-1,-1,-1))&1
+        return np.packbits(bits.astype(np.uint8))
+    L = np.lcm(k,8) # bits in a group of words that fills whole bytes
+    (g,nb) = (L//k,L//8) # words and bytes in a group
+    nGroups = -(-len(words)//g)
+    w = np.zeros(nGroups*g,dtype=np.uint64)
+    w[:len(words)] = words
+    acc = np.bitwise_or.reduce(w.reshape(nGroups,g)<<np.arange(L-k,-1,-k,dtype=np.uint64),axis=1)
+    packedBits = (acc[:,None]>>np.arange(L-8,-1,-8,dtype=np.uint64))&np.uint64(0xFF)
+    return packedBits.astype(np.uint8).ravel()[:nBytes]
+
+def unpackWords(packedBits,k,nWords=None):
+    """
+    Split a np.packbits style uint8 buffer (MSB first) into k-bit words,
+    the inverse of packWords
+    Parameters:
+        packedBits : uint8 buffer
+        k : number of bits in each word
+        nWords : number of words to extract, default = all complete words
+    Returns:
+        words : integer words in the range 0 to 2^k-1
+    """
+    packedBits = np.asarray(packedBits,dtype=np.uint8)
+    if nWords is None:
+        nWords = 8*len(packedBits)//k
+    if nWords*k > 8*len(packedBits):
+        raise ValueError('Not enough bits in the buffer for the requested words')
+    if k > 8:
+        bits = np.unpackbits(packedBits,count=nWords*k).reshape(nWords,k)
+        return bits.astype(np.int64) @ (1<<np.arange(k-1,-1,-1))
+    L = np.lcm(k,8) # bits in a group of words that fills whole bytes
+    (g,nb) = (L//k,L//8) # words and bytes in a group
+    nGroups = -(-nWords//g)
+    b = np.zeros(nGroups*nb,dtype=np.uint64)
+    n = min(len(packedBits),len(b))
+    b[:n] = packedBits[:n]
+    acc = np.bitwise_or.reduce(b.reshape(nGroups,nb)<<np.arange(L-8,-1,-8,dtype=np.uint64),axis=1)
+    words = (acc[:,None]>>np.arange(L-k,-1,-k,dtype=np.uint64))&np.uint64((1<<k)-1)
+    return words.astype(np.int64).ravel()[:nWords]
+
+def countBitErrors(txBits,rxBits):
+    """
+    Number of differing bits between two packed uint8 buffers (XOR + popcount)
+    """
+    return int(np.sum(POPCOUNT[np.bitwise_xor(txBits,rxBits)],dtype=np.int64))
+
+class Modem:
+    __metadata__ = abc.ABCMeta
+    # Base class: Modem
+    # Attribute definitions:
+    #    self.M : number of points in the MPSK constellation
+    #    self.name: name of the modem : PSK, QAM, PAM, FSK
+    #    self.constellation : reference constellation (complex128 or complex64)
+    #    self.coherence : only for 'coherent' or 'noncoherent' FSK
+    #    self.detectorMemory : byte budget for each block of distances in iqDetector
+    #    self.bitLabels : bit label of each constellation point (MSB first)
+    #    self.useLUT : True = demodulate with the lookup-table detector (lutDetector)
+    #    self.detectorLUT : lookup table for lutDetector, built once on first use
+    detectorMemory = 2**26 # 64 MB by default, can be set per instance
+    lutCells = 512 # number of grid cells along each axis of the detector LUT
+    lutCandidates = 8 # longest candidate list kept for a boundary cell of the LUT
+    
+    def __init__(self,M,constellation,name,coherence=None,useLUT=False,
+                 bitLabels=None,dtype=np.complex128): #constructor
+        if (M<2) or ((M & (M -1))!=0): #if M not a power of 2
+            raise ValueError('M should be a power of 2')
+        if name.lower()=='fsk':
+            if (coherence.lower()=='coherent') or (coherence.lower()=='noncoherent'):
+                self.coherence = coherence
+            else:
+                raise ValueError('Coherence must be \'coherent\' or \'noncoherent\'')
+        else:
+            self.coherence = None
+        self.M = M # number of points in the constellation
+        self.name = name # name of the modem : PSK, QAM, PAM, FSK
+        self.constellation = np.asarray(constellation,dtype=dtype) # reference constellation
+        if bitLabels is None:
+            bitLabels = np.arange(0,M) # label = symbol index by default
+        self.bitLabels = bitLabels # Gray labels for PSK/QAM/PAM
+        self.labelToSym = np.argsort(bitLabels) # inverse map: bit label -> symbol
+        self.useLUT = useLUT # lookup-table detection for irregular constellations
+        self.detectorLUT = None # cached lookup table, built by lutDetector
+    
+    def plotConstellation(self):
+        """
+        Plot the reference constellation points for the selected modem
+        """
+        from math import log2
+        if self.name.lower()=='fsk':
+            return 0 # FSK is multi-dimensional difficult to visualize 
+        
+        import matplotlib.pyplot as plt # deferred, only needed for plotting
+        fig, axs = plt.subplots(1, 1)
+        axs.plot(np.real(self.constellation),np.imag(self.constellation),'o')        
+        for i in range(0,self.M):
+            axs.annotate("{0:0{1}b}".format(self.bitLabels[i],int(log2(self.M))), (np.real(self.constellation[i]),np.imag(self.constellation[i])))
+        
+        axs.set_title('Constellation');
+        axs.set_xlabel('I');axs.set_ylabel('Q');fig.show()
+    
+    def modulate(self,inputSymbols):
+        """
+            Modulate a vector of input symbols (numpy array format) using the chosen
+             modem. The input symbols take integer values in the range 0 to M-1.
+        """
+        if isinstance(inputSymbols,list):
+            inputSymbols = np.array(inputSymbols)
+        
+        if  not (0 <= inputSymbols.all() <= self.M-1):
+            raise ValueError('Values for inputSymbols are beyond the range 0 to M-1')
+        
+        modulatedVec = self.constellation[inputSymbols]
+        return modulatedVec #return modulated vector
+    
+    def modulateBits(self,packedBits,nBits=None):
+        """
+            Modulate a packed bit buffer (np.packbits format, MSB first). Every
+            log2(M) bits form a label that is mapped to its symbol through the
+            bitLabels (Gray) lookup table.
+        Parameters:
+            packedBits : uint8 buffer with the payload bits
+            nBits : number of valid bits in the buffer, default = 8*len(packedBits)
+                    must be a multiple of log2(M)
+        Returns:
+            modulatedVec : modulated symbol vector
+        """
+        k = int(np.log2(self.M)) # bits per symbol
+        if nBits is None:
+            nBits = 8*len(packedBits)
+        if nBits % k:
+            raise ValueError('Number of bits must be a multiple of log2(M)')
+        words = unpackWords(packedBits,k,nBits//k) # bit labels
+        modulatedVec = self.constellation[self.labelToSym[words]]
+        return modulatedVec
+    
+    def demodulate(self,receivedSyms):
+        """
+            Demodulate a vector of received symbols using the chosen modem.            
+        """        
+        if isinstance(receivedSyms,list):
+            receivedSyms = np.array(receivedSyms)
+        
+        if self.useLUT:
+            detectedSyms = self.lutDetector(receivedSyms) # cached LUT lookup
+        else:
+            detectedSyms= self.iqDetector(receivedSyms)
+        return detectedSyms
+    
+    def demodulateBits(self,receivedSyms,*args):
+        """
+            Demodulate a vector of received symbols to a packed bit buffer
+            (np.packbits format, MSB first), the inverse of modulateBits. Extra
+            arguments are passed on to demodulate (ex: coherence for FSK).
+        Returns:
+            packedBits : uint8 buffer of ceil(N*log2(M)/8) bytes, bit errors
+                         can be counted with countBitErrors
+        """
+        detectedSyms = self.demodulate(receivedSyms,*args)
+        k = int(np.log2(self.M)) # bits per symbol
+        return packWords(self.bitLabels[detectedSyms],k)
+    
+    def iqDetector(self,receivedSyms,maxBytes=None):
+        """
+        Optimum Detector for 2-dim. signals (ex: MQAM,MPSK,MPAM) in IQ Plane
+        Note: MPAM/BPSK are one dimensional modulations. The same function can be 
+        applied for these modulations since quadrature is zero (Q=0)
+        
+        The function computes the squared Euclidean distance of each point in the
+        received vector against every point in the reference constellation. It then
+        returns the symbols from the reference constellation that provide the
+        minimum Euclidean distance. This brute-force search is the fallback for
+        arbitrary constellations; PSKModem, QAMModem and PAMModem override it
+        with closed-form slicers.
+        
+        The distances are evaluated with complex arithmetic in the expanded form
+        |r-c|^2 = |r|^2 - 2Re(r.c*) + |c|^2, where |r|^2 is dropped since it does
+        not change the decision. The received vector is streamed in blocks of
+        rows sized to fit maxBytes: one work buffer is allocated and reused for
+        every block, and the decisions are written into a preallocated index
+        array, so peak memory does not grow with the number of received symbols.
+        Rows of an N x M matrix (MFSK) are treated as M-dimensional points.
+        
+        Parameters:
+            receivedSyms : received symbol vector of complex form
+            maxBytes : memory budget in bytes for the block of distances
+                       default None = self.detectorMemory
+        Returns:
+            detectedSyms:decoded symbols that provide the minimum Euclidean distance        
+        """
+        if maxBytes is None:
+            maxBytes = self.detectorMemory
+        receivedSyms = np.asarray(receivedSyms)
+        N = len(receivedSyms) # number of received symbols
+        C = np.reshape(self.constellation,(self.M,-1)) # M x K reference points
+        R = np.reshape(receivedSyms,(N,C.shape[1])) # N x K received points (view)
+        CH = np.conj(C).T # K x M conjugate transpose of the reference
+        Es = np.sum(np.abs(C)**2,axis=1) # |c|^2 for every reference point
+        
+        dtype = np.result_type(R.dtype,CH.dtype,np.complex64)
+        B = int(max(1,min(N,maxBytes//(self.M*np.dtype(dtype).itemsize)))) # rows per block
+        buf = np.empty((B,self.M),dtype=dtype) # reusable block of r.c* products
+        detectedSyms = np.empty(N,dtype=np.intp) # preallocated decisions
+        for start in range(0,N,B):
+            stop = min(start+B,N)
+            d = buf[:stop-start]
+            np.matmul(R[start:stop],CH,out=d) # r.c* for every pair in the block
+            metric = d.real # view - distance metric computed in place
+            metric *= -2
+            metric += Es # |c|^2 - 2Re(r.c*)
+            np.argmin(metric,axis=1,out=detectedSyms[start:stop])
+        return detectedSyms
+
+    def modulateFixed(self,inputSymbols,fracBits,dtype=np.int16):
+        """
+        Modulate to fixed-point I/Q: the constellation is quantized once to the
+        Q-format with fracBits fractional bits (saturating) and looked up.
+        Parameters:
+            inputSymbols : integer symbols in the range 0 to M-1
+            fracBits : number of fractional bits of the Q-format
+            dtype : int16 (default) or int8
+        Returns:
+            q : N x 2 integer array of interleaved I/Q samples
+        """
+        if self.constellation.ndim!=1:
+            raise ValueError('Fixed-point mode needs a one-dimensional constellation')
+        return quantize(self.constellation,fracBits,dtype)[np.asarray(inputSymbols)]
+    
+    def demodulateFixed(self,q,fracBits,maxBytes=None):
+        """
+        Minimum Euclidean distance detection directly on fixed-point I/Q
+        
+        The reference points are quantized to the same Q-format as the samples
+        and the metric |c|^2 - 2(I.cI + Q.cQ) is evaluated exactly in int64, in
+        blocks of rows bounded by maxBytes.
+        Parameters:
+            q : N x 2 integer array of interleaved I/Q samples
+            fracBits : number of fractional bits of the Q-format
+            maxBytes : memory budget in bytes for each block
+                       default None = self.detectorMemory
+        Returns:
+            detectedSyms : decoded symbols (indices 0 to M-1)
+        """
+        if self.constellation.ndim!=1:
+            raise ValueError('Fixed-point mode needs a one-dimensional constellation')
+        if maxBytes is None:
+            maxBytes = self.detectorMemory
+        C = quantize(self.constellation,fracBits,np.int64) # integer reference points
+        (cI,cQ) = (C[:,0],C[:,1])
+        E = cI*cI+cQ*cQ # energy of every point
+        N = len(q)
+        B = int(max(1,min(N,maxBytes//(2*self.M*8)))) # rows per block
+        (d,t) = (np.empty((B,self.M),dtype=np.int64),np.empty((B,self.M),dtype=np.int64))
+        detectedSyms = np.empty(N,dtype=np.intp)
+        for start in range(0,N,B):
+            stop = min(start+B,N)
+            (db,tb) = (d[:stop-start],t[:stop-start])
+            np.multiply(q[start:stop,0,None],cI,out=db,dtype=np.int64)
+            np.multiply(q[start:stop,1,None],cQ,out=tb,dtype=np.int64)
+            db += tb
+            db *= -2
+            db += E
+            np.argmin(db,axis=1,out=detectedSyms[start:stop])
+        return detectedSyms
+    
+    def buildLUT(self,cells=None):
+        """
+        Build the lookup table used by lutDetector
+        
+        The IQ plane around the constellation (bounding box plus a margin of a
+        quarter of its span on each side) is quantized into a cells x cells grid.
+        For every cell the nearest constellation point to the cell centre is
+        stored. A point c_i can only be the nearest one somewhere in the cell if
+        its distance to the centre is within twice the half-diagonal of the
+        minimum distance, so cells with more than one such candidate straddle a
+        decision boundary and keep the short, sorted candidate list instead.
+        Cells with more than self.lutCandidates candidates (e.g. near the centre
+        of a large MPSK) are left to the exhaustive search. The grid is evaluated
+        in blocks bounded by self.detectorMemory.
+        
+        Parameters:
+            cells : number of grid cells along each axis
+                    default None = self.lutCells
+        Returns:
+            lut : Dictionary containing the following keyword entries:
+              x0, y0 : lower-left corner of the grid
+              step : side of each grid cell
+              cells : number of cells along each axis
+              nearest : nearest symbol to the centre of each cell
+              ambiguous : row in 'candidates' for boundary cells, -1 for cells
+                          inside one decision region, -2 for exhaustive search
+              candidates : candidate symbols of the boundary cells (padded with
+                           the first candidate)
+        """
+        if self.constellation.ndim != 1:
+            raise ValueError('Lookup-table detection needs an IQ plane constellation')
+        if cells is None:
+            cells = self.lutCells
+        C = self.constellation
+        (xmin,xmax) = (np.min(np.real(C)),np.max(np.real(C)))
+        (ymin,ymax) = (np.min(np.imag(C)),np.max(np.imag(C)))
+        span = max(xmax-xmin,ymax-ymin) # side of the square bounding box
+        step = 1.5*span/cells # span plus a margin of span/4 on each side
+        x0 = (xmin+xmax)/2-cells*step/2 # lower-left corner of the grid
+        y0 = (ymin+ymax)/2-cells*step/2
+        
+        g = (np.arange(cells)+0.5)*step # cell centres along each axis
+        centres = np.ravel((x0+g)[:,None]+1j*(y0+g)[None,:]) # cell = ix*cells+iy
+        tol = np.sqrt(2)*step*(1+1e-6) # twice the half-diagonal, with margin
+        
+        nearest = np.empty(cells*cells,dtype=np.int32)
+        ambiguous = np.full(cells*cells,-1,dtype=np.int32)
+        candidates = [] # candidate lists of boundary cells in each block
+        nAmb = 0
+        B = int(max(1,self.detectorMemory//(16*self.M))) # cells per block
+        for start in range(0,cells*cells,B):
+            q = centres[start:start+B]
+            d = np.abs(q[:,None]-C[None,:]) # distances cell centre -> points
+            nearest[start:start+B] = np.argmin(d,axis=1)
+            mask = d <= np.min(d,axis=1)[:,None]+tol # possible nearest points
+            count = np.sum(mask,axis=1)
+            ambiguous[start+np.flatnonzero(count>self.lutCandidates)] = -2
+            rows = np.flatnonzero((count>1)&(count<=self.lutCandidates)) # boundary
+            ambiguous[start+rows] = nAmb+np.arange(len(rows))
+            nAmb += len(rows)
+            # sorted indices of the candidates first, then pad with the first one
+            idx = np.argsort(~mask[rows],axis=1,kind='stable')
+            candidates.append((idx,count[rows]))
+        
+        L = max([1]+[int(np.max(c)) for (_,c) in candidates if len(c)])
+        cand = np.zeros((nAmb,L),dtype=np.int32)
+        row = 0
+        for (idx,count) in candidates:
+            block = idx[:,:L]
+            pad = np.arange(L)[None,:] >= count[:,None]
+            cand[row:row+len(idx)] = np.where(pad,block[:,:1],block)
+            row += len(idx)
+        
+        lut = dict()
+        # python floats, so indexing complex64 symbols stays in single precision
+        lut['x0']=float(x0);lut['y0']=float(y0);lut['step']=float(step);lut['cells']=cells
+        lut['nearest']=nearest;lut['ambiguous']=ambiguous;lut['candidates']=cand
+        return lut
+    
+    def lutDetector(self,receivedSyms):
+        """
+        Minimum Euclidean distance detector using a precomputed lookup table
+        
+        Each received symbol is mapped to its cell in the quantized IQ grid
+        (see buildLUT) in O(1). Cells inside a single decision region give the
+        detected symbol directly, boundary cells compare the distances to their
+        short candidate list only. Symbols falling outside the grid, or in cells
+        with too many candidates, are resolved with the exhaustive search in
+        Modem.iqDetector. The table is built on the
+        first call and cached in self.detectorLUT, so it is reused by every
+        later call to demodulate (e.g. across a Monte Carlo sweep).
+        
+        Parameters:
+            receivedSyms : received symbol vector of complex form
+        Returns:
+            detectedSyms : decoded symbols that provide the minimum Euclidean distance
+        """
+        if self.detectorLUT is None:
+            lut = self.buildLUT() # build once, reuse afterwards
+            for value in lut.values():
+                if isinstance(value,np.ndarray):
+                    value.setflags(write=False) # shared read-only by every call
+            self.detectorLUT = lut
+        lut = self.detectorLUT
+        receivedSyms = np.asarray(receivedSyms)
+        n = lut['cells']
+        ix = np.floor((np.real(receivedSyms)-lut['x0'])/lut['step'])
+        iy = np.floor((np.imag(receivedSyms)-lut['y0'])/lut['step'])
+        inside = (ix>=0)&(ix<n)&(iy>=0)&(iy<n)
+        cell = np.where(inside,ix*n+iy,0).astype(np.intp) # cell of each symbol
+        
+        detectedSyms = lut['nearest'][cell].astype(np.intp)
+        row = np.where(inside,lut['ambiguous'][cell],-2)
+        amb = np.flatnonzero(row>=0) # symbols in boundary cells
+        if len(amb):
+            cand = lut['candidates'][row[amb]] # short candidate lists
+            d = np.abs(receivedSyms[amb,None]-self.constellation[cand])
+            best = np.argmin(d,axis=1)
+            detectedSyms[amb] = cand[np.arange(len(amb)),best]
+        out = np.flatnonzero(row==-2) # outside the grid - exhaustive search
+        if len(out):
+            detectedSyms[out] = Modem.iqDetector(self,receivedSyms[out])
+        return detectedSyms
+
+    def llrDemapper(self,receivedSyms,N0,method='exact',dtype=None):
+        """
+        Soft demapper: bit log-likelihood ratios for the received symbols
+        
+        LLR(b) = log P(b=0|r)/P(b=1|r) for every bit of self.bitLabels, assuming
+        AWGN with E|n|^2 = N0 (noise of variance N0/2 in each dimension, as
+        added by channels.awgn). The received vector is processed in blocks of
+        rows bounded by self.detectorMemory and the LLRs are written into a
+        preallocated output array.
+        
+        Parameters:
+            receivedSyms : received symbol vector of complex form
+            N0 : noise power spectral density, scalar or one value per symbol
+            method : 'exact' (log-sum-exp) or 'maxlog' (max-log approximation)
+            dtype : floating point type of the computation and of the output
+                    default None = precision of receivedSyms (float32 for
+                    complex64 input, float64 otherwise)
+        Returns:
+            llrs : N x log2(M) array of LLRs (MSB of each label first),
+                   positive values favour bit 0
+        """
+        if method not in ('exact','maxlog'):
+            raise ValueError('method must be \'exact\' or \'maxlog\'')
+        receivedSyms = np.asarray(receivedSyms)
+        if dtype is None: # same precision as the received symbols
+            dtype = np.finfo(np.result_type(receivedSyms.dtype,np.float32)).dtype
+        N0 = np.asarray(N0,dtype=dtype)
+        N = len(receivedSyms)
+        nBits = int(np.log2(self.M))
+        llrs = np.empty((N,nBits),dtype=dtype)
+        B = int(max(1,self.detectorMemory//(4*self.M*np.dtype(dtype).itemsize)))
+        for start in range(0,N,B):
+            stop = min(start+B,N)
+            n0 = N0 if N0.ndim==0 else N0[start:stop,None]
+            self.blockLLR(receivedSyms[start:stop],n0,method,llrs[start:stop])
+        return llrs
+    
+    def blockLLR(self,receivedSyms,N0,method,out):
+        """
+        LLRs of one block of received symbols for llrDemapper, written into out.
+        Generic O(M) per symbol version: the log-likelihood of every point is
+        -|r-s|^2/N0, evaluated as (2Re(r.s*)-|s|^2)/N0 since |r|^2 is common
+        to all points and cancels in the LLR.
+        """
+        C = np.reshape(self.constellation,(self.M,-1)) # M x K reference points
+        R = np.reshape(receivedSyms,(len(receivedSyms),C.shape[1]))
+        ctype = np.result_type(out.dtype,np.complex64) # complex type of same precision
+        metric = np.real(np.matmul(R.astype(ctype,copy=False),np.conj(C).T.astype(ctype)))
+        metric *= 2
+        metric -= np.sum(np.abs(C)**2,axis=1).astype(out.dtype)
+        metric /= N0
+        bitLLR(metric,self.bitLabels,out.shape[1],method,out)
+
+class PAMModem(Modem):
+    # Derived class: PAMModem
+    def __init__(self, M, dtype=np.complex128):
+        m = np.arange(0,M) #all information symbols m={0,1,...,M-1}
+        constellation = 2*m+1-M + 1j*0  # reference constellation        
+        bitLabels = m^(m>>1) # Gray labels along the real axis
+        Modem.__init__(self, M, constellation, name='PAM',bitLabels=bitLabels,
+                       dtype=dtype) #set the modem attributes
+    
+    def iqDetector(self,receivedSyms):
+        """
+        Minimum Euclidean distance detector for MPAM (overrides Modem.iqDetector)
+        
+        The amplitudes 2m+1-M are uniformly spaced on the real axis, so the
+        nearest point is found by slicing the in-phase component: the decision
+        boundaries sit at the even integers and points beyond the outer
+        boundaries are clipped to the edge symbols. The cost is O(N) with no
+        N x M distance matrix.
+        
+        Parameters:
+            receivedSyms : received symbol vector of complex form
+        Returns:
+            detectedSyms : decoded symbols (indices 0 to M-1)
+        """
+        I = np.floor((np.real(receivedSyms)+self.M)/2) # decision region index
+        detectedSyms = np.clip(I,0,self.M-1).astype(int) # saturate outer regions
+        return detectedSyms
+    
+    def demodulateFixed(self,q,fracBits,maxBytes=None):
+        """
+        Detection on fixed-point I/Q (overrides Modem.demodulateFixed)
+        
+        Integer version of iqDetector: with the amplitudes 2m+1-M scaled by
+        2^fracBits, the region index is (I + M*2^fracBits) >> (fracBits+1),
+        clipped to the outer symbols. The Q samples are ignored.
+        Parameters:
+            q : N x 2 integer array of interleaved I/Q samples
+            fracBits : number of fractional bits of the Q-format
+            maxBytes : not used (O(N) detector)
+        Returns:
+            detectedSyms : decoded symbols (indices 0 to M-1)
+        """
+        I = q[:,0].astype(np.int32)+(self.M<<fracBits)
+        I >>= fracBits+1 # decision region index
+        return np.clip(I,0,self.M-1).astype(np.intp) # saturate outer regions
+    
+    def blockLLR(self,receivedSyms,N0,method,out):
+        """
+        LLRs of one block for llrDemapper (overrides Modem.blockLLR). Only the
+        in-phase component carries information, with noise variance N0/2.
+        """
+        levels = np.real(self.constellation).astype(out.dtype) # PAM amplitudes
+        x = np.real(receivedSyms).astype(out.dtype,copy=False)
+        metric = -(x[:,None]-levels)**2/N0
+        bitLLR(metric,self.bitLabels,out.shape[1],method,out)
+            
+class PSKModem(Modem):
+    # Derived class: PSKModem
+    def __init__(self, M, dtype=np.complex128):        
+        #Generate reference constellation
+        m = np.arange(0,M) #all information symbols m={0,1,...,M-1}
+        I = 1/np.sqrt(2)*np.cos(m/M*2*np.pi)
+        Q = 1/np.sqrt(2)*np.sin(m/M*2*np.pi)
+        constellation = I + 1j*Q #reference constellation        
+        bitLabels = m^(m>>1) # Gray labels around the circle
+        Modem.__init__(self, M, constellation, name='PSK',bitLabels=bitLabels,
+                       dtype=dtype) #set the modem attributes
+    
+    def iqDetector(self,receivedSyms):
+        """
+        Minimum Euclidean distance detector for MPSK (overrides Modem.iqDetector)
+        
+        All MPSK points have equal energy, so the nearest point is the one
+        closest in phase. The phase of each received symbol is quantized to
+        the nearest multiple of 2*pi/M and wrapped to the range 0 to M-1.
+        The cost is O(N) with no N x M distance matrix.
+        
+        Parameters:
+            receivedSyms : received symbol vector of complex form
+        Returns:
+            detectedSyms : decoded symbols (indices 0 to M-1)
+        """
+        theta = np.angle(receivedSyms) # phase in the range (-pi,pi]
+        m = np.rint(theta*self.M/(2*np.pi)) # nearest phase index
+        detectedSyms = np.mod(m,self.M).astype(int) # wrap negative phases
+        return detectedSyms
+        
+class QAMModem(Modem):
+    # Derived class: QAMModem
+    def __init__(self,M,dtype=np.complex128):
+        if (M==1) or (np.mod(np.log2(M),2)!=0): # M not a even power of 2
+            raise ValueError('Only square MQAM supported. M must be even power of 2')
+        
+        n = np.arange(0,M) # Sequential address from 0 to M-1 (1xM dimension)
+        a = n^(n>>1) #convert linear addresses to Gray code
+        D = np.sqrt(M).astype(int) #Dimension of K-Map - N x N matrix
+        a = np.reshape(a,(D,D)) # NxN gray coded matrix
+        oddRows=np.arange(start = 1, stop = D ,step=2) # identify alternate rows
+        a[oddRows,:] = np.fliplr(a[oddRows,:]) #Flip rows - KMap representation
+        nGray=np.reshape(a,(M)) # reshape to 1xM - Gray code walk on KMap
+        self.D = D # number of PAM levels on each axis
+        self.grayToSym = np.argsort(nGray) # inverse map: KMap address -> symbol
+        
+        #Construction of ideal M-QAM constellation from sqrt(M)-PAM
+        (x,y)=np.divmod(nGray,D) #element-wise quotient and remainder
+        Ax=2*x+1-D # PAM Amplitudes 2d+1-D - real axis
+        Ay=2*y+1-D # PAM Amplitudes 2d+1-D - imag axis
+        constellation = Ax+1j*Ay
+        #Gray labels per axis: I level gives the upper bits, Q level the lower bits
+        k = int(np.log2(D)) # bits per axis
+        self.axisLabels = np.arange(0,D)^(np.arange(0,D)>>1) # Gray code of each PAM level
+        bitLabels = (self.axisLabels[x]<<k)|self.axisLabels[y]
+        Modem.__init__(self, M, constellation, name='QAM',bitLabels=bitLabels,
+                       dtype=dtype) #set the modem attributes
+    
+    def iqDetector(self,receivedSyms):
+        """
+        Minimum Euclidean distance detector for square MQAM
+        (overrides Modem.iqDetector)
+        
+        Square MQAM is the product of two sqrt(M)-PAM constellations, so the
+        nearest point is found by slicing the I and Q components independently
+        (rounding to the PAM grid and clipping to the outer levels). The
+        resulting KMap address x*D+y is mapped back to the symbol index through
+        the inverse Gray table. The cost is O(N) with no N x M distance matrix.
+        
+        Parameters:
+            receivedSyms : received symbol vector of complex form
+        Returns:
+            detectedSyms : decoded symbols (indices 0 to M-1)
+        """
+        D = self.D
+        x = np.clip(np.floor((np.real(receivedSyms)+D)/2),0,D-1).astype(int)
+        y = np.clip(np.floor((np.imag(receivedSyms)+D)/2),0,D-1).astype(int)
+        detectedSyms = self.grayToSym[x*D+y] # KMap address -> symbol index
+        return detectedSyms
+    
+    def demodulateFixed(self,q,fracBits,maxBytes=None):
+        """
+        Detection on fixed-point I/Q (overrides Modem.demodulateFixed)
+        
+        Integer version of iqDetector: with the PAM levels 2d+1-D scaled by
+        2^fracBits, the level index of each axis is
+        (x + D*2^fracBits) >> (fracBits+1), clipped to the outer levels.
+        Parameters:
+            q : N x 2 integer array of interleaved I/Q samples
+            fracBits : number of fractional bits of the Q-format
+            maxBytes : not used (O(N) detector)
+        Returns:
+            detectedSyms : decoded symbols (indices 0 to M-1)
+        """
+        D = self.D
+        xy = q.astype(np.int32)+(D<<fracBits)
+        xy >>= fracBits+1 # level index of I and Q
+        np.clip(xy,0,D-1,out=xy)
+        return self.grayToSym[xy[:,0]*D+xy[:,1]] # KMap address -> symbol index
+    
+    def blockLLR(self,receivedSyms,N0,method,out):
+        """
+        LLRs of one block for llrDemapper (overrides Modem.blockLLR)
+        
+        The Gray labels are separable: the upper half of the bits depends only
+        on the I level and the lower half only on the Q level. The likelihood
+        of a point factors into an I term and a Q term, so the LLRs of each half
+        are computed exactly from the sqrt(M) PAM levels of that axis alone,
+        O(sqrt(M)) per symbol instead of O(M).
+        """
+        D = self.D; k = out.shape[1]//2 # bits per axis
+        levels = (2*np.arange(0,D)+1-D).astype(out.dtype) # PAM amplitudes per axis
+        for (part,bits) in ((np.real,slice(0,k)),(np.imag,slice(k,2*k))):
+            x = part(receivedSyms).astype(out.dtype,copy=False)
+            metric = -(x[:,None]-levels)**2/N0
+            bitLLR(metric,self.axisLabels,k,method,out[:,bits])
+        
+class FSKModem(Modem):
+    # Derivied class: FSKModem
+    #   rng : numpy.random.Generator (or seed) for the noncoherent phases,
+    #         default None = global numpy.random state
+    def __init__(self,M,coherence='coherent',dtype=np.complex128,rng=None):
+        if coherence.lower()=='coherent':
+            phi= np.zeros(M) # phase=0 for coherent detection
+        elif coherence.lower()=='noncoherent':
+            u = np.random.rand(M) if rng is None else np.random.default_rng(rng).random(M)
+            phi = 2*np.pi*u # M random phases in the (0,2pi)
+        else:
+            raise ValueError('Coherence must be \'coherent\' or \'noncoherent\'')
+        constellation = np.diag(np.exp(1j*phi))
+        Modem.__init__(self, M, constellation, name='FSK',coherence=coherence.lower(),
+                       dtype=dtype) #set the base modem attributes
+        self.tones = np.exp(1j*phi).astype(dtype) # diagonal of the constellation
+    
+    def iqDetector(self,receivedSyms,maxBytes=None):
+        """
+        Coherent minimum Euclidean distance detector for MFSK
+        (overrides Modem.iqDetector)
+        
+        The tones are orthogonal with unit energy, so |r-s_i|^2 = |r|^2 + 1 -
+        2Re(r_i.exp(-j*phi_i)) and the nearest tone is the branch with the
+        largest real correlation: O(M) per symbol instead of the O(M^2)
+        distances to every M-dimensional point. Rows are processed in blocks
+        bounded by maxBytes.
+        
+        Parameters:
+            receivedSyms : N x M matrix of correlator outputs
+            maxBytes : memory budget in bytes for each block
+                       default None = self.detectorMemory
+        Returns:
+            detectedSyms : decoded symbols (indices 0 to M-1)
+        """
+        if maxBytes is None:
+            maxBytes = self.detectorMemory
+        receivedSyms = np.asarray(receivedSyms)
+        N = len(receivedSyms)
+        (c,s) = (np.real(self.tones),np.imag(self.tones)) # cos(phi), sin(phi)
+        B = int(max(1,min(N,maxBytes//(self.M*c.itemsize)))) # rows per block
+        buf = np.empty((B,self.M),dtype=np.result_type(np.real(receivedSyms[:0]),c))
+        detectedSyms = np.empty(N,dtype=np.intp)
+        for start in range(0,N,B):
+            stop = min(start+B,N)
+            r = receivedSyms[start:stop]
+            d = buf[:stop-start]
+            np.multiply(np.real(r),c,out=d) # Re(r.exp(-j*phi))
+            d += np.imag(r)*s
+            np.argmax(d,axis=1,out=detectedSyms[start:stop])
+        return detectedSyms
+    
+    def simulateAWGN(self,inputSymbols,EsN0dB,coherence=None,maxBytes=None,rng=None):
+        """
+        Compact MFSK simulation over AWGN, from symbol indices to decisions
+        
+        Gives the same result as demodulate(awgn(modulate(inputSymbols),EsN0dB))
+        without the N x M transmit matrix. For each block of symbols the M
+        correlator outputs are generated directly: complex noise in every
+        branch plus exp(j*phi) in the branch of the transmitted tone. They are
+        detected right away, so memory is bounded by maxBytes per block and only
+        the index vectors grow with the number of symbols.
+        
+        Parameters:
+            inputSymbols : transmitted symbols (integers 0 to M-1)
+            EsN0dB : SNR per symbol in dB (unit energy tones, N0 = 1/(Es/N0))
+            coherence : 'coherent' or 'noncoherent' detection
+                        default None = self.coherence
+            maxBytes : memory budget in bytes for each block of correlator outputs
+                       default None = self.detectorMemory
+            rng : numpy.random.Generator (or seed) for the noise,
+                  default None = global numpy.random state
+        Returns:
+            detectedSyms : detected symbols (indices 0 to M-1)
+        """
+        if rng is not None:
+            rng = np.random.default_rng(rng)
+        if coherence is None:
+            coherence = self.coherence
+        if coherence.lower() not in ('coherent','noncoherent'):
+            raise ValueError('Coherence must be \'coherent\' or \'noncoherent\'')
+        if maxBytes is None:
+            maxBytes = self.detectorMemory
+        inputSymbols = np.asarray(inputSymbols)
+        N = len(inputSymbols)
+        ftype = np.finfo(self.tones.dtype).dtype # real type of the tones
+        N0 = 1/10**(EsN0dB/10) # every tone has unit energy
+        scale = ftype.type(np.sqrt(N0/2)) # noise std. dev. per dimension
+        B = int(max(1,min(N,maxBytes//(self.M*self.tones.itemsize)))) # rows per block
+        detectedSyms = np.empty(N,dtype=np.intp)
+        for start in range(0,N,B):
+            stop = min(start+B,N)
+            syms = inputSymbols[start:stop]
+            shape = (stop-start,self.M)
+            y = gaussianNoise(shape,ftype,rng)+1j*gaussianNoise(shape,ftype,rng)
+            y *= scale # correlator noise of every branch
+            y[np.arange(stop-start),syms] += self.tones[syms] # transmitted tone
+            if coherence.lower()=='coherent':
+                detectedSyms[start:stop] = self.iqDetector(y,maxBytes)
+            else:
+                np.argmax(np.abs(y),axis=1,out=detectedSyms[start:stop])
+        return detectedSyms
+        
+    def demodulate(self, receivedSyms,coherence='coherent'):
+        #overridden method in Modem class
+        if coherence.lower()=='coherent':
+            return self.iqDetector(receivedSyms)
+        elif coherence.lower()=='noncoherent':
+            return np.argmax(np.abs(receivedSyms),axis=1)
+        else:
+            raise ValueError('Coherence must be \'coherent\' or \'noncoherent\'')
+
+class CrossQAMModem(Modem):
+    # Derived class: CrossQAMModem - QAM for an odd number of bits per symbol
+    #   M = 8 : 4 x 2 rectangular grid
+    #   M = 32,128,512,... : cross constellation, a S x S square grid with a
+    #   c x c square removed at each corner (S = 3*2^((k-3)/2), c = 2^((k-5)/2))
+    def __init__(self,M,dtype=np.complex128):
+        k = int(np.log2(M)) # bits per symbol
+        if (M<8) or (k%2==0) or (M & (M-1)):
+            raise ValueError('Cross/rectangular MQAM needs M an odd power of 2, M>=8')
+        m = (k-1)//2
+        W = 2**(m+1); H = 2**m # Gray coded W x H rectangle of the labels
+        (x,y) = np.divmod(np.arange(0,M),H) # rectangle column and row
+        labels = ((x^(x>>1))<<m)|(y^(y>>1)) # Gray code along each axis
+        if k==3: # rectangular 8-QAM
+            (Sx,Sy,c) = (W,H,0)
+            (X,Y) = (x,y)
+        else: # fold the outer columns of the rectangle onto the top and bottom
+            T = 2**(m-2) # columns moved on each side = size of a missing corner
+            (Sx,Sy,c) = (3*2**(m-1),3*2**(m-1),T)
+            (X,Y) = (x-T,y+T) # columns kept in place
+            moved = (x<T)|(x>=W-T)
+            left = x<T; up = y>=H//2
+            a = np.where(left,x,W-1-x) # distance from the outer edge
+            b = np.where(up,y-H//2,H//2-1-y) # distance from the centre row
+            X = np.where(moved,T+np.where(left,b,H-1-b),X)
+            Y = np.where(moved,np.where(up,Sy-T+a,T-1-a),Y)
+        constellation = np.empty(M,dtype=complex)
+        constellation[labels] = (2*X+1-Sx)+1j*(2*Y+1-Sy) # symbol index = bit label
+        self.Sx = Sx; self.Sy = Sy; self.c = c # grid size and missing corner size
+        self.gridToSym = np.full(Sx*Sy,-1) # grid address X*Sy+Y -> symbol (-1 = corner)
+        self.gridToSym[X*Sy+Y] = labels
+        Modem.__init__(self, M, constellation, name='QAM',dtype=dtype) #set the modem attributes
+    
+    def iqDetector(self,receivedSyms):
+        """
+        Minimum Euclidean distance detector for cross/rectangular MQAM
+        (overrides Modem.iqDetector)
+        
+        The constellation is the union of a horizontal band (every column,
+        rows c to Sy-1-c) and a vertical band (columns c to Sx-1-c, every
+        row). The nearest point of each band is found by slicing I and Q and
+        clipping to the band, as for square QAM, and the nearer of the two is
+        the detected point. The cost is O(N) with no N x M distance matrix.
+        
+        Parameters:
+            receivedSyms : received symbol vector of complex form
+        Returns:
+            detectedSyms : decoded symbols (indices 0 to M-1)
+        """
+        (Sx,Sy,c) = (self.Sx,self.Sy,self.c)
+        (I,Q) = (np.real(receivedSyms),np.imag(receivedSyms))
+        x = np.floor((I+Sx)/2) # column index on the full grid
+        y = np.floor((Q+Sy)/2) # row index on the full grid
+        (xh,yh) = (np.clip(x,0,Sx-1),np.clip(y,c,Sy-1-c)) # horizontal band
+        (xv,yv) = (np.clip(x,c,Sx-1-c),np.clip(y,0,Sy-1)) # vertical band
+        dh = (I-(2*xh+1-Sx))**2+(Q-(2*yh+1-Sy))**2
+        dv = (I-(2*xv+1-Sx))**2+(Q-(2*yv+1-Sy))**2
+        useV = dv<dh
+        X = np.where(useV,xv,xh).astype(int)
+        Y = np.where(useV,yv,yh).astype(int)
+        detectedSyms = self.gridToSym[X*Sy+Y] # grid address -> symbol index
+        return detectedSyms
+
+class APSKModem(Modem):
+    # Derived class: APSKModem - DVB-S2 style amplitude and phase shift keying
+    #   M = 16 : 4+12 points on two rings
+    #   M = 32 : 4+12+16 points on three rings
+    # Ring radii are relative to the inner ring (ringRatios), the default values
+    # are the DVB-S2 ratios for code rate 3/4. Detection uses the lookup-table
+    # detector (Modem.lutDetector) since the rings have no closed-form slicer.
+    rings = {16:(4,12),32:(4,12,16)} # points per ring
+    offsets = {16:(np.pi/4,np.pi/12),32:(np.pi/4,np.pi/12,0)} # phase of first point
+    defaultRatios = {16:(2.85,),32:(2.84,5.27)} # outer/inner radius ratios
+    # bit label of each point, ring by ring in increasing phase: searched so that
+    # nearest neighbours differ in one bit (1.125 bits on average for 32-APSK)
+    labels = {16:(1,5,7,3,8,9,13,12,4,6,14,15,11,10,2,0),
+              32:(17,1,0,16,27,25,9,13,5,21,20,4,6,2,18,19,
+                  29,31,11,3,7,15,12,8,24,28,14,10,26,30,22,23)}
+    
+    def __init__(self,M,ringRatios=None,dtype=np.complex128):
+        if M not in self.rings:
+            raise ValueError('APSK supports M=16 (4+12) and M=32 (4+12+16)')
+        if ringRatios is None:
+            ringRatios = self.defaultRatios[M]
+        radii = np.concatenate(([1.0],ringRatios))
+        n = np.array(self.rings[M]) # points per ring
+        ring = np.repeat(np.arange(len(n)),n) # ring of every point
+        j = np.arange(M)-np.repeat(np.cumsum(n)-n,n) # position on its ring
+        phase = np.take(self.offsets[M],ring)+2*np.pi*j/n[ring]
+        points = radii[ring]*np.exp(1j*phase)
+        labels = np.array(self.labels[M])
+        constellation = np.empty(M,dtype=complex)
+        constellation[labels] = points # symbol index = bit label
+        self.ringRatios = tuple(ringRatios)
+        Modem.__init__(self, M, constellation, name='APSK',useLUT=True,
+                       dtype=dtype) #set the modem attributes
+
+def getModem(name,M,coherence='coherent',dtype=np.complex128,seed=None):
+    """
+    Modem factory backed by an LRU cache
+    
+    Repeated requests for the same (name, M, coherence, dtype) return the same
+    instance, so sweeps and worker processes build each modem only once.
+    All array attributes of the returned modem (constellation, bit labels,
+    inverse tables) are read-only, so the instance can be shared between
+    threads, and forked worker processes share its pages without copying.
+    Note that a cached noncoherent FSK modem keeps the same random phases;
+    pass an integer seed to make those phases reproducible.
+    
+    Parameters:
+        name : 'PSK','QAM','PAM','FSK','APSK'
+        M : modulation level (QAM with an odd number of bits per symbol
+            gives the cross/rectangular CrossQAMModem)
+        coherence : 'coherent' or 'noncoherent', only applicable for FSK
+        dtype : complex128 (default) or complex64
+        seed : integer seed of the noncoherent FSK phases
+               default None = global numpy.random state
+    Returns:
+        modem : shared, read-only modem instance
+    """
+    name = name.lower()
+    if name not in modemClasses:
+        raise ValueError('Invalid value for name: '+str(name))
+    if name!='fsk':
+        coherence = None # same cache entry whatever coherence is passed
+    else:
+        coherence = coherence.lower()
+    if (coherence!='noncoherent'):
+        seed = None # only the noncoherent FSK phases are random
+    return cachedModem(name,M,coherence,np.dtype(dtype).name,seed)
+
+@lru_cache(maxsize=64)
+def cachedModem(name,M,coherence,dtype,seed=None):
+    """
+    Build the modem for getModem and freeze its arrays (cached)
+    """
+    if name=='fsk':
+        modem = modemClasses[name](M,coherence,dtype=dtype,rng=seed)
+    elif name=='qam' and int(np.log2(M))%2: # odd bits per symbol
+        modem = CrossQAMModem(M,dtype=dtype)
+    else:
+        modem = modemClasses[name](M,dtype=dtype)
+    for value in vars(modem).values():
+        if isinstance(value,np.ndarray):
+            value.setflags(write=False) # read-only, safe to share
+    return modem
+
+modemClasses = {'psk': PSKModem,'qam':QAMModem,'pam':PAMModem,'fsk':FSKModem,
+                'apsk':APSKModem}
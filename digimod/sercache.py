@@ -0,0 +1,179 @@
+import os
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+CACHE_VERSION = 1 # bump to invalidate every stored curve
+channels = ('awgn','rayleigh','rician','nakagami','shadowing')
+
+sources = ('ErrorRates.py','modem.py') # code the curves depend on (APSK rings, ...)
+
+def sourceHash():
+    """
+    Short hash of the sources the curves depend on: any change to the
+    formulas or to the constellations gives new cache keys, so stale curves
+    are never returned after an upgrade
+    """
+    h = hashlib.sha256()
+    for name in sources:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)),name),'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()[:12]
+
+class SERCache:
+    # Memoization of the theoretical SER curves of ErrorRates
+    # Two levels: an in-process LRU of the most recent curves and an on-disk
+    # store (one .npy file per curve) under a versioned cache directory, shared
+    # by all processes and runs. The disk store is bounded by maxBytes: when it
+    # grows beyond, the least recently used files are deleted (every hit
+    # refreshes the modification time of its file). Returned arrays are
+    # read-only since they are shared.
+    #   directory : cache directory, default None = $DIGIMOD_CACHE_DIR or
+    #               ~/.cache/digimod
+    #   maxBytes : size bound of the disk store in bytes
+    #   maxEntries : number of curves kept in memory
+    def __init__(self,directory=None,maxBytes=2**26,maxEntries=256):
+        if directory is None:
+            directory = os.environ.get('DIGIMOD_CACHE_DIR',
+                                       os.path.join(os.path.expanduser('~'),'.cache','digimod'))
+        self.version = str(CACHE_VERSION)+'-'+sourceHash()
+        self.directory = os.path.join(directory,'ser-v'+self.version)
+        self.maxBytes = maxBytes
+        self.maxEntries = maxEntries
+        self.memory = OrderedDict() # key -> curve, most recent last
+        (self.hits,self.misses) = (0,0)
+    
+    def key(self,channel,EbN0dBs,mod_type,M,param=None,coherence=None):
+        """
+        Cache key of a curve: hash of the version, the parameters and the
+        bytes of the SNR grid
+        """
+        h = hashlib.sha256(self.version.encode())
+        coherence = coherence.lower() if (mod_type.lower()=='fsk' and coherence) else None
+        h.update(repr((channel.lower(),mod_type.lower(),int(M),coherence)).encode())
+        for a in (param,EbN0dBs):
+            a = np.ascontiguousarray(a if a is not None else np.nan,dtype=np.float64)
+            h.update(repr(a.shape).encode())
+            h.update(a.tobytes())
+        return h.hexdigest()[:32]
+    
+    def ser(self,channel,EbN0dBs,mod_type,M,param=None,coherence=None):
+        """
+        Theoretical Symbol Error Rates, from the cache when available
+        Parameters:
+            channel : 'awgn','rayleigh','rician','nakagami','shadowing'
+            EbN0dBs : list of SNR per bit values in dB scale
+            mod_type : 'PSK','QAM','PAM','FSK','APSK' (as accepted by the channel)
+            M : Modulation level for the chosen modulation
+            param : fading parameter: K_dB (rician), m (nakagami),
+                    sigma_dB (shadowing); scalar or array
+            coherence : 'coherent'/'noncoherent', only applicable for FSK
+        Returns:
+            SERs = read-only array of symbol error rates
+        """
+        channel = channel.lower()
+        if channel not in channels:
+            raise ValueError('channel must be one of '+', '.join(channels))
+        if (channel in ('rician','nakagami','shadowing')) and (param is None):
+            raise ValueError('The '+channel+' channel needs its fading parameter')
+        k = self.key(channel,EbN0dBs,mod_type,M,param,coherence)
+        if k in self.memory: # in-process LRU
+            self.memory.move_to_end(k)
+            self.hits += 1
+            return self.memory[k]
+        path = os.path.join(self.directory,k+'.npy')
+        try: # disk store
+            SERs = np.load(path)
+            os.utime(path) # refresh for the LRU eviction
+            self.hits += 1
+        except (OSError,ValueError):
+            SERs = self.compute(channel,EbN0dBs,mod_type,M,param,coherence)
+            self.misses += 1
+            self.store(path,SERs)
+        SERs.setflags(write=False)
+        self.memory[k] = SERs
+        if len(self.memory)>self.maxEntries:
+            self.memory.popitem(last=False) # least recently used
+        return SERs
+    
+    def compute(self,channel,EbN0dBs,mod_type,M,param,coherence):
+        """
+        Evaluate a curve with the ErrorRates functions
+        """
+        from . import ErrorRates
+        EbN0dBs = np.asarray(EbN0dBs,dtype=float)
+        if channel=='awgn':
+            SERs = ErrorRates.ser_awgn(EbN0dBs,mod_type,M,coherence)
+        elif channel=='rayleigh':
+            SERs = ErrorRates.ser_rayleigh(EbN0dBs,mod_type,M)
+        elif channel=='rician':
+            SERs = ErrorRates.ser_rician(param,EbN0dBs,mod_type,M)
+        elif channel=='nakagami':
+            SERs = ErrorRates.ser_nakagami(param,EbN0dBs,mod_type,M)
+        else:
+            SERs = ErrorRates.ser_shadowing(param,EbN0dBs,mod_type,M)
+        return np.array(SERs,dtype=float)
+    
+    def store(self,path,SERs):
+        """
+        Write a curve atomically (temporary file + rename), then enforce the
+        size bound of the disk store
+        """
+        try:
+            os.makedirs(self.directory,exist_ok=True)
+            tmp = path+'.'+str(os.getpid())+'.tmp'
+            with open(tmp,'wb') as f:
+                np.save(f,SERs)
+            os.replace(tmp,path)
+            self.evict()
+        except OSError: # read-only or full disk: keep the in-memory level only
+            pass
+    
+    def evict(self):
+        """
+        Delete the least recently used files until the store fits in maxBytes
+        """
+        entries = []
+        for e in os.scandir(self.directory):
+            if e.name.endswith('.npy'):
+                st = e.stat()
+                entries.append((st.st_mtime,st.st_size,e.path))
+        total = sum(size for (_,size,_) in entries)
+        for (_,size,p) in sorted(entries): # oldest first
+            if total<=self.maxBytes:
+                break
+            try:
+                os.remove(p)
+                total -= size
+            except OSError: # already removed by another process
+                pass
+    
+    def clear(self):
+        """
+        Empty the in-process LRU and the disk store of this version
+        """
+        self.memory.clear()
+        if os.path.isdir(self.directory):
+            for e in os.scandir(self.directory):
+                if e.name.endswith('.npy'):
+                    os.remove(e.path)
+
+defaultCache = None # created on first use
+
+def ser_cached(channel,EbN0dBs,mod_type,M,param=None,coherence=None):
+    """
+    Theoretical Symbol Error Rates through the shared default SERCache
+    Parameters:
+        channel : 'awgn','rayleigh','rician','nakagami','shadowing'
+        EbN0dBs : list of SNR per bit values in dB scale
+        mod_type : 'PSK','QAM','PAM','FSK','APSK' (as accepted by the channel)
+        M : Modulation level for the chosen modulation
+        param : K_dB (rician), m (nakagami) or sigma_dB (shadowing)
+        coherence : 'coherent'/'noncoherent', only applicable for FSK
+    Returns:
+        SERs = read-only array of symbol error rates
+    """
+    global defaultCache
+    if defaultCache is None:
+        defaultCache = SERCache()
+    return defaultCache.ser(channel,EbN0dBs,mod_type,M,param,coherence)
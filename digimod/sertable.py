@@ -0,0 +1,195 @@
+import json
+from math import exp
+from functools import lru_cache
+import numpy as np
+from .sercache import ser_cached
+
+def pchipSlopes(x,y):
+    """
+    Fritsch-Carlson slopes of the monotone piecewise cubic Hermite interpolant
+    (same as scipy PchipInterpolator): no overshoot, so monotone data give a
+    monotone interpolant
+    """
+    h = np.diff(x)
+    delta = np.diff(y)/h
+    d = np.zeros_like(y)
+    (h0,h1) = (h[:-1],h[1:])
+    (w1,w2) = (2*h1+h0,h1+2*h0)
+    same = (delta[:-1]*delta[1:])>0 # zero slope at local extrema and flats
+    with np.errstate(divide='ignore',invalid='ignore'):
+        d[1:-1] = np.where(same,(w1+w2)/(w1/delta[:-1]+w2/delta[1:]),0)
+    for (i,j,k) in ((0,0,1),(-1,-1,-2)): # one-sided three-point end slopes
+        (ha,hb) = (h[j],h[k])
+        e = ((2*ha+hb)*delta[j]-ha*delta[k])/(ha+hb)
+        if np.sign(e)!=np.sign(delta[j]):
+            e = 0
+        elif (np.sign(delta[j])!=np.sign(delta[k])) and (abs(e)>abs(3*delta[j])):
+            e = 3*delta[j]
+        d[i] = e
+    return d
+
+class SERTable:
+    # Precomputed SER curve for fast (vectorized) lookups
+    # The curve SER(Es/N0) is evaluated once with ErrorRates (through the disk
+    # cache of sercache) on a uniform Es/N0 grid in dB, and stored as log(SER)
+    # with the slopes of its monotone cubic (PCHIP) interpolant. A query is one
+    # index computation on the uniform grid plus a cubic Hermite evaluation, so
+    # no search nor special function is needed. The inverse mapping (required
+    # Es/N0 for a target SER) solves the same cubic, so both directions agree.
+    # The grid stops once SER falls below minSER; beyond the grid, log(SER) is
+    # extrapolated linearly with the last slope (an upper bound, since log(SER)
+    # decays faster than linearly in dB) and clamped at the first point below.
+    #   channel,mod_type,M,param,coherence : as in sercache.ser_cached
+    #   EsN0dBs : (start,stop,step) of the uniform Es/N0 grid in dB
+    #   minSER : smallest tabulated SER (closed forms lose their relative
+    #            accuracy to cancellation much below 1e-12)
+    def __init__(self,channel,mod_type,M,param=None,coherence=None,
+                 EsN0dBs=(-10,60,0.05),minSER=1e-12,table=None):
+        self.info = {'channel':channel.lower(),'mod_type':mod_type.lower(),'M':int(M),
+                     'param':None if param is None else float(param),
+                     'coherence':coherence if mod_type.lower()=='fsk' else None,
+                     'minSER':minSER}
+        if table is None: # build (otherwise loaded, see SERTable.load)
+            (start,stop,step) = EsN0dBs
+            x = start+step*np.arange(int(round((stop-start)/step))+1)
+            EbN0dBs = x-10*np.log10(np.log2(M))
+            SERs = ser_cached(channel,EbN0dBs,mod_type,M,param,coherence)
+            n = np.argmax(SERs<minSER)+1 if np.any(SERs<minSER) else len(x)
+            y = np.log(np.maximum(SERs[:n],np.finfo(float).tiny))
+            y = np.minimum.accumulate(y) # drop quadrature wiggles: non-increasing
+            table = np.vstack((x[:n],y,pchipSlopes(x[:n],y)))
+        self.table = table # rows: Es/N0 (dB), log(SER), d log(SER)/d Es/N0
+        (self.x,self.y,self.d) = table
+        self.x0 = float(self.x[0])
+        self.step = float(self.x[1]-self.x[0])
+        self.n = self.x.shape[0]
+    
+    def hermite(self,i,t):
+        """
+        Cubic Hermite interpolant of log(SER) on interval i at position t in [0,1]
+        """
+        (y0,y1) = (self.y[i],self.y[i+1])
+        (m0,m1) = (self.step*self.d[i],self.step*self.d[i+1])
+        return y0+t*(m0+t*(3*(y1-y0)-2*m0-m1+t*(2*(y0-y1)+m0+m1)))
+    
+    def logSER(self,EsN0dB):
+        """
+        Natural log of the SER at the given Es/N0 values in dB (vectorized)
+        """
+        if isinstance(EsN0dB,(int,float)): # scalar: plain floats, no array overhead
+            u = (float(EsN0dB)-self.x0)/self.step
+            i = min(max(int(u//1),0),self.n-2)
+            t = max(u-i,0.0)
+            if t>1:
+                return self.y.item(-1)+(t-1)*self.step*self.d.item(-1)
+            (y0,y1) = (self.y.item(i),self.y.item(i+1))
+            (m0,m1) = (self.step*self.d.item(i),self.step*self.d.item(i+1))
+            return y0+t*(m0+t*(3*(y1-y0)-2*m0-m1+t*(2*(y0-y1)+m0+m1)))
+        u = (np.asarray(EsN0dB,dtype=float)-self.x0)/self.step
+        i = np.clip(np.floor(u).astype(np.intp),0,self.n-2)
+        t = np.clip(u-i,0,None) # below the grid: clamped to the first point
+        out = self.hermite(i,np.minimum(t,1))
+        beyond = t>1 # above the grid: linear extrapolation in log(SER)
+        if np.any(beyond):
+            out = np.where(beyond,self.y[-1]+(t-1)*self.step*self.d[-1],out)
+        return out
+    
+    def ser(self,EsN0dB):
+        """
+        Symbol error rate at the given Es/N0 values in dB (vectorized)
+        Parameters:
+            EsN0dB : scalar or array of SNR per symbol values in dB scale
+        Returns:
+            SERs = symbol error rates, same shape as EsN0dB
+        """
+        if isinstance(EsN0dB,(int,float)):
+            return exp(self.logSER(EsN0dB))
+        return np.exp(self.logSER(EsN0dB))
+    
+    def requiredEsN0(self,targetSER,iterations=8):
+        """
+        Smallest Es/N0 in dB at which the SER reaches the target (vectorized)
+        Parameters:
+            targetSER : scalar or array of target symbol error rates
+            iterations : safeguarded Newton steps on the cubic of the interval
+        Returns:
+            EsN0dB = required SNR per symbol in dB; -inf if the target is above
+                     the SER at the start of the grid, extrapolated linearly in
+                     log(SER) below the last tabulated SER
+        """
+        yt = np.log(np.asarray(targetSER,dtype=float))
+        # log(SER) is decreasing: search on its negative
+        i = np.clip(np.searchsorted(-self.y,-yt)-1,0,self.n-2)
+        (lo,hi) = (np.zeros_like(yt),np.ones_like(yt))
+        dy = self.y[i+1]-self.y[i]
+        t = np.clip(np.divide(yt-self.y[i],dy,out=np.full_like(yt,0.5),where=dy!=0),0,1)
+        for _ in range(iterations): # Newton, falling back to bisection
+            (m0,m1) = (self.step*self.d[i],self.step*self.d[i+1])
+            f = self.hermite(i,t)-yt
+            (lo,hi) = (np.where(f>0,t,lo),np.where(f>0,hi,t)) # f decreasing in t
+            (y0,y1) = (self.y[i],self.y[i+1])
+            df = m0+t*(2*(3*(y1-y0)-2*m0-m1)+3*t*(2*(y0-y1)+m0+m1))
+            with np.errstate(divide='ignore',invalid='ignore'):
+                tn = t-f/df
+            t = np.where((tn>lo)&(tn<hi),tn,(lo+hi)/2)
+        EsN0dB = self.x[i]+t*self.step
+        below = yt<self.y[-1] # beyond the grid
+        if np.any(below):
+            EsN0dB = np.where(below,self.x[-1]+(yt-self.y[-1])/self.d[-1],EsN0dB)
+        return np.where(yt>self.y[0],-np.inf,EsN0dB)
+    
+    def save(self,path):
+        """
+        Write the table as an .npy file (memory-mappable) plus a .json file
+        with its parameters
+        Parameters:
+            path : file name, '.npy' is appended if missing
+        """
+        path = path if path.endswith('.npy') else path+'.npy'
+        np.save(path,np.ascontiguousarray(self.table))
+        with open(path[:-4]+'.json','w') as f:
+            json.dump(self.info,f)
+    
+    @classmethod
+    def load(cls,path,mmap=True):
+        """
+        Read a table written by save
+        Parameters:
+            path : file name, '.npy' is appended if missing
+            mmap : memory-map the table (read-only), so worker processes
+                   share its pages instead of loading a copy each
+        Returns:
+            table = SERTable instance
+        """
+        path = path if path.endswith('.npy') else path+'.npy'
+        with open(path[:-4]+'.json') as f:
+            info = json.load(f)
+        table = np.load(path,mmap_mode='r' if mmap else None)
+        return cls(info['channel'],info['mod_type'],info['M'],info['param'],
+                   info['coherence'],minSER=info['minSER'],table=table)
+
+def serTable(channel,mod_type,M,param=None,coherence=None):
+    """
+    SER lookup table factory backed by an LRU cache: repeated requests for the
+    same curve return the same SERTable (default grid)
+    Parameters:
+        channel : 'awgn','rayleigh','rician','nakagami','shadowing'
+        mod_type : 'PSK','QAM','PAM','FSK','APSK' (as accepted by the channel)
+        M : Modulation level for the chosen modulation
+        param : scalar K_dB (rician), m (nakagami) or sigma_dB (shadowing)
+        coherence : 'coherent'/'noncoherent', only applicable for FSK
+    Returns:
+        table = SERTable instance
+    """
+    coherence = coherence.lower() if (mod_type.lower()=='fsk' and coherence) else None
+    param = None if param is None else float(param)
+    return cachedTable(channel.lower(),mod_type.lower(),int(M),param,coherence)
+
+@lru_cache(maxsize=128)
+def cachedTable(channel,mod_type,M,param,coherence):
+    """
+    Build the table for serTable (cached)
+    """
+    table = SERTable(channel,mod_type,M,param,coherence)
+    table.table.setflags(write=False) # read-only, safe to share
+    return table